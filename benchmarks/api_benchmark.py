@@ -0,0 +1,107 @@
+'''Compares the overhead of the in-process API (pdv.collect_graph) with the CLI path
+(pdv.print_dependencies) when they are called many times in one process.
+
+Cases:
+    api               - pdv.collect_graph and iteration over the nodes and edges
+    cli_export_json   - pdv.print_dependencies with --export-json and reading the json back
+    cli_gv            - pdv.print_dependencies writing the graphviz source
+                        (skipped when the graphviz module is not installed)
+
+The projects are generated in a temporary directory.
+'''
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+from benchmark_record import add_results_argument, create_record, write_record
+import pdv
+
+
+_global_project_template = '''<?xml version="1.0" encoding="utf-8"?>
+<Project ToolsVersion="15.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <PropertyGroup>
+    <OutputType>Library</OutputType>
+  </PropertyGroup>
+  <ItemGroup>
+{}  </ItemGroup>
+</Project>
+'''
+
+
+def write_projects(root_dir, projects_count):
+    '''Writes projects where every project references up to 3 previous ones,
+       returns the path of the last project (it depends on all the others)'''
+    project_filepath = None
+    for number in range(projects_count):
+        references = ''.join(
+            '    <ProjectReference Include="..\\Project{0}\\Project{0}.csproj" />\n'.format(
+                dependency) for dependency in range(max(0, number - 3), number))
+        project_dir = os.path.join(root_dir, 'Project{}'.format(number))
+        os.makedirs(project_dir)
+        project_filepath = os.path.join(project_dir, 'Project{}.csproj'.format(number))
+        with open(project_filepath, 'wt') as project_file:
+            project_file.write(_global_project_template.format(references).replace(
+                '\\', os.sep))
+
+    return project_filepath
+
+
+def measure(function, calls):
+    start_time = time.perf_counter()
+    for _ in range(calls):
+        function()
+    total_time = time.perf_counter() - start_time
+
+    return dict(total_secs=total_time, per_call_secs=total_time / calls)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Compare the in-process API with the CLI path.')
+    arg_parser.add_argument('--calls', type=int, default=1000)
+    arg_parser.add_argument('--projects', type=int, default=20,
+                            help='Number of the projects in the graph')
+    add_results_argument(arg_parser)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_filepath = write_projects(os.path.join(temp_dir, 'src'), args.projects)
+        json_filepath = os.path.join(temp_dir, 'out', 'graph.json')
+        cli_args = ['--proj', project_filepath, '--dep-item', 'ProjectReference']
+        dependencies_info = [pdv.MSBuildItemDependencyInfo('ProjectReference', None)]
+
+        def collect_with_api():
+            graph = pdv.collect_graph(dependencies_info, projects=[project_filepath])
+            return sum(1 for _ in graph.get_nodes()), sum(1 for _ in graph.get_edges())
+
+        def collect_with_cli_json():
+            pdv.print_dependencies(cli_args + ['--export-json', json_filepath])
+            with open(json_filepath, 'rt', encoding='utf-8') as json_file:
+                graph_dict = json.load(json_file)
+            return len(graph_dict['projects']), len(graph_dict['dependencies'])
+
+        def collect_with_cli_gv():
+            pdv.print_dependencies(cli_args + ['--outdir', os.path.join(temp_dir, 'out')])
+
+        assert collect_with_api() == collect_with_cli_json()
+
+        cases = dict(api=collect_with_api, cli_export_json=collect_with_cli_json)
+        try:
+            import graphviz
+            cases['cli_gv'] = collect_with_cli_gv
+        except ImportError:
+            pass
+
+        results = dict((name, measure(function, args.calls)) for name, function in cases.items())
+
+    write_record(create_record(results, calls=args.calls, projects=args.projects),
+                 args.results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+'''Shared parts of the benchmarks.
+
+Importing this module makes the pdv package of the sources importable.
+Results of a benchmark are a record printed as json, "--results FilePath"
+appends the record as a json line to the file to compare the results
+between changes.
+'''
+import os
+import sys
+import json
+import time
+import platform
+
+
+_global_src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+sys.path.insert(0, _global_src_dir)
+
+
+def get_src_directory():
+    return _global_src_dir
+
+
+def add_results_argument(arg_parser):
+    arg_parser.add_argument('--results', metavar='FilePath',
+                            help='Append results as a json line to the file')
+
+
+def create_record(results, **parameters):
+    '''Returns the record of the results with the time, the python version
+       and the benchmark parameters'''
+    record = dict(timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  python=platform.python_version())
+    record.update(parameters)
+    record['results'] = results
+    return record
+
+
+def write_record(record, results_filepath):
+    '''Prints the record and appends it to the results_filepath (if any)'''
+    print(json.dumps(record, indent=2))
+
+    if results_filepath:
+        with open(results_filepath, 'at') as results_file:
+            results_file.write(json.dumps(record) + '\n')
+
+
+def read_last_record(results_filepath):
+    with open(results_filepath, 'rt') as results_file:
+        return json.loads(results_file.readlines()[-1])
@@ -0,0 +1,49 @@
+'''Compares the dependencies collection time with and without the byte pre-scan.
+
+Accepts the same projects arguments as pdv, for example:
+    python prescan_benchmark.py --sln PythonTools.sln --dep-item Import --config projects_config.ini
+'''
+import os
+import sys
+import time
+import logging
+
+# makes pdv of the sources importable
+import benchmark_record
+import pdv
+
+
+def measure_collection(proj_settings, use_prescan, repeat):
+    variables = pdv.parse_config(proj_settings.config) if proj_settings.config else None
+
+    best_time = None
+    collector = None
+    for _ in range(repeat):
+        collector = pdv.DependenciesCollector(proj_settings.dependenies_info, use_prescan,
+                                              variables)
+        start_time = time.perf_counter()
+        collector.collect_dependencies(proj_settings.get_all_projects())
+        spent_time = time.perf_counter() - start_time
+        best_time = spent_time if best_time is None else min(best_time, spent_time)
+
+    return best_time, collector.prescanner
+
+
+def main():
+    logging.basicConfig(format='%(levelname)s: %(message)s', level=logging.WARNING)
+
+    repeat = 5
+    proj_settings, _, _ = pdv.parse_arguments(sys.argv[1:])
+
+    full_parse_time, _ = measure_collection(proj_settings, False, repeat)
+    prescan_time, prescanner = measure_collection(proj_settings, True, repeat)
+
+    print('Best of {} runs'.format(repeat))
+    print('  without pre-scan: {:0.4f} secs'.format(full_parse_time))
+    print('  with pre-scan:    {:0.4f} secs'.format(prescan_time))
+    print('  files scanned: {}, parsing skipped: {}'.format(
+        prescanner.scanned_files, prescanner.skipped_files))
+
+
+if __name__ == '__main__':
+    main()
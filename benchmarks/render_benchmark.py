@@ -0,0 +1,179 @@
+'''Compares the rendering time of the built-in layered svg renderer (--native-render)
+with the graphviz dot.
+
+Cases:
+    examples/*/generated/*.dot  - the bundled examples
+    synthetic_N                 - generated layered graphs of N nodes (see --synthetic)
+
+The *.dot files are read by a simple reader of the sources written by pdv.
+dot is skipped when it is not found in the PATH or takes more than --dot-timeout.
+'''
+import os
+import re
+import sys
+import glob
+import time
+import random
+import shutil
+import logging
+import argparse
+import contextlib
+import subprocess
+import tempfile
+
+from benchmark_record import add_results_argument, create_record, write_record
+import pdv
+
+
+_global_examples_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+
+_global_attribute_pattern = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|[^\s\]"]+)')
+_global_edge_pattern = re.compile(r'^(\S+) -> (\S+)(?: \[(.*)\])?$')
+_global_node_pattern = re.compile(r'^(\S+) \[(.*)\]$')
+_global_subgraph_pattern = re.compile(r'^subgraph (\S+) \{$')
+
+
+def parse_attributes(text):
+    attributes = {}
+    for name, value in _global_attribute_pattern.findall(text or ''):
+        if value.startswith('"'):
+            value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        attributes[name] = value
+    return attributes
+
+
+def read_dot_file(dot_filepath, digraph_object):
+    '''Fills the digraph_object from the graphviz source written by pdv'''
+    views = [digraph_object]
+    subgraphs = contextlib.ExitStack()
+    with subgraphs, open(dot_filepath, 'rt', encoding='utf-8') as dot_file:
+        for line in dot_file:
+            line = line.strip()
+            if not line or line.startswith('//') or line.startswith('digraph'):
+                continue
+
+            if line == '}':
+                if len(views) > 1:
+                    views.pop()
+                continue
+
+            subgraph_match = _global_subgraph_pattern.match(line)
+            if subgraph_match:
+                views.append(subgraphs.enter_context(
+                    views[-1].subgraph(name=subgraph_match.group(1))))
+                continue
+
+            edge_match = _global_edge_pattern.match(line)
+            if edge_match:
+                views[-1].edge(edge_match.group(1), edge_match.group(2),
+                               **parse_attributes(edge_match.group(3)))
+                continue
+
+            node_match = _global_node_pattern.match(line)
+            if node_match:
+                name = node_match.group(1)
+                if name in ('node', 'edge', 'graph'):
+                    views[-1].attr(name, **parse_attributes(node_match.group(2)))
+                else:
+                    views[-1].node(name, **parse_attributes(node_match.group(2)))
+                continue
+
+            # graph attributes
+            views[-1].attr(**parse_attributes(line))
+
+
+def write_synthetic_dot(dot_filepath, nodes_count, seed=1):
+    '''Writes a layered graph of projects grouped into directories,
+       every project depends on a few projects of the lower layers'''
+    generator = random.Random(seed)
+    layers_count = max(2, int(nodes_count ** 0.5) // 4)
+    directories_count = max(1, nodes_count // 20)
+
+    with open(dot_filepath, 'wt', encoding='utf-8') as dot_file:
+        dot_file.write('digraph Synthetic {\n\trankdir=LR\n')
+        dot_file.write('\tnode [color=brown fillcolor=beige penwidth=2 shape=box '
+                       'style="filled, rounded"]\n')
+        for number in range(nodes_count):
+            layer = number % layers_count
+            for _ in range(generator.randint(0, 4) if layer else 0):
+                dependency = generator.randrange(nodes_count)
+                if dependency % layers_count < layer:
+                    dot_file.write('\tnode{} -> node{}\n'.format(number, dependency))
+
+        for directory in range(directories_count):
+            dot_file.write('\tsubgraph cluster_dir{0} {{\n\t\tlabel="dir{0}/"\n'.format(directory))
+            for number in range(directory, nodes_count, directories_count):
+                dot_file.write('\t\tnode{0} [label="Project{0}.csproj"]\n'.format(number))
+            dot_file.write('\t}\n')
+        dot_file.write('}\n')
+
+
+def measure_native(dot_filepath, output_dir, repeat):
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        digraph_object = pdv.LayeredDigraph(filename=os.path.basename(dot_filepath),
+                                            directory=output_dir)
+        read_dot_file(dot_filepath, digraph_object)
+        digraph_object.render()
+        times.append(time.perf_counter() - start_time)
+
+    return min(times)
+
+
+def measure_dot(dot_filepath, output_dir, timeout):
+    if not shutil.which('dot'):
+        return None
+
+    svg_filepath = os.path.join(output_dir, os.path.basename(dot_filepath) + '.graphviz.svg')
+    start_time = time.perf_counter()
+    try:
+        subprocess.run(['dot', '-Tsvg', dot_filepath, '-o', svg_filepath],
+                       check=True, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+        return None
+
+    return time.perf_counter() - start_time
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Compare the native svg renderer with graphviz dot.')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--synthetic', type=int, nargs='*', default=[1000, 10000],
+                            metavar='NodesCount',
+                            help='Sizes of the generated graphs. Default: %(default)s')
+    arg_parser.add_argument('--dot-timeout', type=float, default=900,
+                            help='Seconds to wait for dot. Default: %(default)s')
+    add_results_argument(arg_parser)
+    args = arg_parser.parse_args()
+
+    # the renderer logs every image
+    logging.disable(logging.INFO)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cases = dict(
+            (os.path.relpath(dot_filepath, _global_examples_dir).replace('\\', '/'),
+             dot_filepath)
+            for dot_filepath in sorted(glob.glob(
+                os.path.join(_global_examples_dir, '*', 'generated', '*.dot'))))
+
+        for nodes_count in args.synthetic:
+            dot_filepath = os.path.join(temp_dir, 'synthetic_{}.dot'.format(nodes_count))
+            write_synthetic_dot(dot_filepath, nodes_count)
+            cases['synthetic_{}'.format(nodes_count)] = dot_filepath
+
+        for name, dot_filepath in cases.items():
+            results[name] = dict(
+                native_secs=measure_native(dot_filepath, temp_dir, args.repeat),
+                dot_secs=measure_dot(dot_filepath, temp_dir, args.dot_timeout))
+            print(name, results[name], file=sys.stderr)
+
+    write_record(create_record(results, repeat=args.repeat), args.results)
+
+
+if __name__ == '__main__':
+    main()
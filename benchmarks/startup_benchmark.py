@@ -0,0 +1,71 @@
+'''Measures the cold start time of pdv in a new python process.
+
+Cases:
+    help                  - "python -m pdv --help"
+    export_json_project   - json export of a single project without dependencies
+'''
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+from benchmark_record import get_src_directory, add_results_argument, create_record, \
+    write_record
+
+
+_global_project_content = '''<?xml version="1.0" encoding="utf-8"?>
+<Project ToolsVersion="15.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <PropertyGroup>
+    <OutputType>Library</OutputType>
+  </PropertyGroup>
+</Project>
+'''
+
+
+def measure_command(command, repeat):
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [get_src_directory(), environment.get('PYTHONPATH')]))
+
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run(command, env=environment, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start_time)
+
+    return dict(min_secs=min(times), median_secs=statistics.median(times))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure pdv cold start time.')
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    add_results_argument(arg_parser)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_filepath = os.path.join(temp_dir, 'Single.csproj')
+        with open(project_filepath, 'wt') as project_file:
+            project_file.write(_global_project_content)
+
+        cases = {
+            'help': [sys.executable, '-m', 'pdv', '--help'],
+            'export_json_project': [sys.executable, '-m', 'pdv',
+                                    '--proj', project_filepath,
+                                    '--dep-item', 'ProjectReference',
+                                    '--export-json', os.path.join(temp_dir, 'graph.json')],
+            # the baseline: start of the interpreter itself
+            'python': [sys.executable, '-c', 'pass'],
+        }
+
+        results = dict((name, measure_command(command, args.repeat))
+                       for name, command in cases.items())
+
+    write_record(create_record(results, repeat=args.repeat), args.results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+'''Measures the main stages of pdv on synthetic repositories (see synthetic_tree.py)
+of several sizes, so performance regressions can be found without external sources.
+
+Stages:
+    parse_solution             - ProjectsSettings.parse_solution of the generated solution
+    collect_dependencies       - DependenciesCollector (ProjectReference and Import items)
+    build_directory_tree       - build_directory_tree of the collected projects
+    create_projects_diagram    - ProjectDependencyPrinter.create_collected_projects_diagram
+                                 of the collected projects writing the graphviz source
+                                 (--native-render writes the svg instead)
+
+Every stage is run --repeat times for the time (the best and the median are recorded)
+and once more under tracemalloc for the peak memory of the python allocations.
+Use "--baseline FilePath" to compare the best times with the last record of the
+results file: the exit code is 1 when a stage is slower than the baseline by more
+than --tolerance.
+'''
+import os
+import sys
+import json
+import timeit
+import logging
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+from benchmark_record import add_results_argument, create_record, write_record, \
+    read_last_record
+from synthetic_tree import generate_tree
+import pdv
+
+
+def measure(function, repeat):
+    '''Returns (result, times secs, peak memory bytes) of the function'''
+    # the stages allocate a lot, so the garbage collector is a part of their time
+    times = timeit.repeat(function, setup='gc.enable()', repeat=repeat, number=1)
+
+    tracemalloc.start()
+    result = function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, times, peak_memory
+
+
+def measure_stages(root_dir, projects_count, native_render, repeat):
+    solution_filepath, config_filepath, _ = generate_tree(root_dir, projects_count)
+
+    dependencies_info = [pdv.MSBuildItemDependencyInfo(item, None)
+                         for item in ('ProjectReference', 'Import')]
+    variables = pdv.parse_config(config_filepath)
+    projects_settings = pdv.ProjectsSettings(None, [solution_filepath], dependencies_info,
+                                             config_filepath, False, None)
+    gv_settings = pdv.GraphVizSettings('Dependencies', 'Synthetic', 'synthetic.gv',
+                                       os.path.join(root_dir, 'out'), 'svg', 'dot',
+                                       'Synthetic', False, False,
+                                       native_render=native_render)
+
+    stages = {}
+
+    def add_stage(name, function):
+        result, times, peak_memory = measure(function, repeat)
+        stages[name] = dict(time_secs=min(times), median_secs=statistics.median(times),
+                            peak_memory_bytes=peak_memory)
+        return result
+
+    projects_paths = add_stage(
+        'parse_solution', lambda: pdv.ProjectsSettings.parse_solution(solution_filepath))
+
+    existing_projects, unknown_projects = add_stage(
+        'collect_dependencies',
+        lambda: pdv.DependenciesCollector(dependencies_info, True,
+                                          variables).collect_dependencies(projects_paths))
+
+    add_stage('build_directory_tree', lambda: pdv.build_directory_tree(existing_projects))
+
+    add_stage('create_projects_diagram',
+              lambda: pdv.ProjectDependencyPrinter(
+                  projects_settings).create_collected_projects_diagram(
+                      existing_projects, unknown_projects, gv_settings))
+
+    return dict(projects_count=len(existing_projects), stages=stages)
+
+
+def get_regressions(record, baseline_record, tolerance):
+    # the diagrams of the different renderers are not comparable
+    skipped_stages = set() if record['native_render'] == baseline_record.get('native_render') \
+        else set(['create_projects_diagram'])
+
+    regressions = []
+    for size, size_results in record['results'].items():
+        baseline_stages = baseline_record['results'].get(size, {}).get('stages', {})
+        for stage, stage_results in size_results['stages'].items():
+            if stage not in baseline_stages or stage in skipped_stages:
+                continue
+            ratio = stage_results['time_secs'] / max(baseline_stages[stage]['time_secs'], 1e-6)
+            if ratio > 1 + tolerance:
+                regressions.append('{} projects, {}: {:.2f}x slower'.format(size, stage, ratio))
+
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Measure pdv stages on synthetic repositories.')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000],
+                            metavar='ProjectsCount',
+                            help='Numbers of the generated projects. Default: %(default)s')
+    arg_parser.add_argument('--repeat', type=int, default=5,
+                            help='Runs of every stage, the best time is compared '
+                                 'with the baseline. Default: %(default)s')
+    arg_parser.add_argument('--native-render', action='store_true',
+                            help='Measure the diagram with the native svg renderer')
+    arg_parser.add_argument('--work-dir', metavar='DirectoryPath',
+                            help='Directory for the generated repositories '
+                                 '(a temporary directory by default)')
+    add_results_argument(arg_parser)
+    arg_parser.add_argument('--baseline', metavar='FilePath',
+                            help='Compare the times with the last json line of the file')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed slowdown against the baseline. Default: %(default)s')
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as temp_dir:
+        for projects_count in args.sizes:
+            results[str(projects_count)] = measure_stages(
+                os.path.join(temp_dir, 'synthetic_{}'.format(projects_count)),
+                projects_count, args.native_render, args.repeat)
+            print(projects_count, json.dumps(results[str(projects_count)]), file=sys.stderr)
+
+    record = create_record(results, repeat=args.repeat, native_render=args.native_render)
+    write_record(record, args.results)
+
+    if args.baseline:
+        regressions = get_regressions(record, read_last_record(args.baseline), args.tolerance)
+        for regression in regressions:
+            print('Regression:', regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+'''Writes a synthetic MSBuild repository for the benchmarks:
+
+    <root>/build/*.props        - shared props, every props imports one of the previous
+                                  (some imports are conditional)
+    <root>/src/.../*.csproj     - projects in a directories tree of the given depth,
+                                  every project references up to fan-out projects
+                                  with lower numbers and imports props via $(BuildRoot)
+    <root>/Synthetic.sln        - solution with all the projects
+    <root>/projects_config.ini  - value of $(BuildRoot) for --config
+
+The same arguments (and seed) always give the same repository. For example:
+    python synthetic_tree.py out_dir --projects 1000 --depth 3 --fan-out 4
+'''
+import os
+import uuid
+import random
+import argparse
+
+
+_global_project_type_guid = '{FAE04EC0-301F-11D3-BF4B-00C04F79EFBC}'
+
+# $(BuildRoot) is defined by the projects_config.ini
+_global_props_path = '$(BuildRoot)' + os.sep + 'Props{}.props'
+
+_global_output_types = ('Library', 'Library', 'Library', 'Exe', 'WinExe')
+
+_global_packages = (('Newtonsoft.Json', ('12.0.3', '13.0.1')),
+                    ('NUnit', ('3.12.0', '3.13.3')),
+                    ('Serilog', ('2.10.0',)))
+
+
+def get_directories(projects_count, depth, branching=8):
+    '''Returns relative directories of the projects: the directories tree has the given
+       depth with up to branching subdirectories in every directory'''
+    directories = []
+    for number in range(projects_count):
+        parts = []
+        index = number
+        for level in range(depth):
+            parts.append('dir{}_{}'.format(level, index % branching))
+            index //= branching
+        parts.append('Project{}'.format(number))
+        directories.append(os.path.join(*parts))
+
+    return directories
+
+
+def write_props(build_dir, props_count, conditional_ratio, generator):
+    os.makedirs(build_dir, exist_ok=True)
+
+    for number in range(props_count):
+        imports = []
+        if number:
+            # every props imports a previous one, some of them by condition
+            imported = generator.randrange(number)
+            condition = ''
+            if generator.random() < conditional_ratio:
+                condition = ' Condition="Exists(\'{}\')"'.format(
+                    _global_props_path.format(imported))
+            imports.append('  <Import Project="{}"{} />\n'.format(
+                _global_props_path.format(imported), condition))
+
+        with open(os.path.join(build_dir, 'Props{}.props'.format(number)), 'wt') as props_file:
+            props_file.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                             '<Project xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n'
+                             '{}'
+                             '  <PropertyGroup>\n'
+                             '    <Props{}Defined>true</Props{}Defined>\n'
+                             '  </PropertyGroup>\n'
+                             '</Project>\n'.format(''.join(imports), number, number))
+
+
+def write_project(project_filepath, project_number, references, props, conditional_ratio,
+                  generator):
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             '<Project ToolsVersion="15.0" '
+             'xmlns="http://schemas.microsoft.com/developer/msbuild/2003">']
+
+    for props_number in props:
+        condition = ''
+        if generator.random() < conditional_ratio:
+            condition = ' Condition="\'$(Configuration)\' == \'Debug\'"'
+        lines.append('  <Import Project="{}"{} />'.format(
+            _global_props_path.format(props_number), condition))
+
+    lines.extend(['  <PropertyGroup>',
+                  '    <OutputType>{}</OutputType>'.format(
+                      generator.choice(_global_output_types)),
+                  '    <AssemblyName>Project{}</AssemblyName>'.format(project_number),
+                  '  </PropertyGroup>',
+                  '  <ItemGroup>'])
+    for reference in references:
+        lines.append('    <ProjectReference Include="{}" />'.format(reference))
+    for package_name, versions in _global_packages:
+        if generator.random() < 0.3:
+            lines.append('    <PackageReference Include="{}" Version="{}" />'.format(
+                package_name, generator.choice(versions)))
+    lines.extend(['  </ItemGroup>',
+                  '  <ItemGroup>',
+                  '    <Compile Include="Class1.cs" />',
+                  '  </ItemGroup>',
+                  '</Project>',
+                  ''])
+
+    with open(project_filepath, 'wt') as project_file:
+        project_file.write('\n'.join(lines))
+
+
+def write_solution(solution_filepath, projects_paths, generator):
+    solution_dir = os.path.dirname(solution_filepath)
+    lines = ['Microsoft Visual Studio Solution File, Format Version 12.00',
+             '# Visual Studio 15']
+    for project_filepath in projects_paths:
+        project_name = os.path.splitext(os.path.basename(project_filepath))[0]
+        project_guid = uuid.UUID(int=generator.getrandbits(128))
+        lines.append('Project("{}") = "{}", "{}", "{{{}}}"'.format(
+            _global_project_type_guid, project_name,
+            os.path.relpath(project_filepath, solution_dir), str(project_guid).upper()))
+        lines.append('EndProject')
+    lines.extend(['Global', 'EndGlobal', ''])
+
+    with open(solution_filepath, 'wt', encoding='utf-8') as solution_file:
+        solution_file.write('\n'.join(lines))
+
+
+def generate_tree(root_dir, projects_count, props_count=20, depth=3, fan_out=4,
+                  conditional_ratio=0.2, seed=1):
+    '''Writes the repository, returns (solution path, config path, projects paths)'''
+    generator = random.Random(seed)
+    root_dir = os.path.abspath(root_dir)
+    build_dir = os.path.join(root_dir, 'build')
+
+    write_props(build_dir, props_count, conditional_ratio, generator)
+
+    directories = get_directories(projects_count, depth)
+    projects_paths = [os.path.join(root_dir, 'src', directory,
+                                   os.path.basename(directory) + '.csproj')
+                      for directory in directories]
+
+    for number, project_filepath in enumerate(projects_paths):
+        project_dir = os.path.dirname(project_filepath)
+        os.makedirs(project_dir, exist_ok=True)
+
+        # dependencies are among the previous projects, mostly the near ones
+        references_count = min(number, generator.randint(0, fan_out))
+        dependencies = set(max(0, number - 1 - int(generator.expovariate(0.05)))
+                           for _ in range(references_count))
+        references = [os.path.relpath(projects_paths[dependency], project_dir)
+                      for dependency in sorted(dependencies)]
+
+        props = sorted(set(generator.randrange(props_count)
+                           for _ in range(generator.randint(1, 3)))) if props_count else []
+
+        write_project(project_filepath, number, references, props, conditional_ratio,
+                      generator)
+
+    solution_filepath = os.path.join(root_dir, 'Synthetic.sln')
+    write_solution(solution_filepath, projects_paths, generator)
+
+    config_filepath = os.path.join(root_dir, 'projects_config.ini')
+    with open(config_filepath, 'wt') as config_file:
+        config_file.write('[DEFAULT]\n$(BuildRoot)={}\n'.format(build_dir))
+
+    return solution_filepath, config_filepath, projects_paths
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Write a synthetic MSBuild repository.')
+    arg_parser.add_argument('root_dir', metavar='DirectoryPath')
+    arg_parser.add_argument('--projects', type=int, default=1000)
+    arg_parser.add_argument('--props', type=int, default=20,
+                            help='Number of the shared *.props files')
+    arg_parser.add_argument('--depth', type=int, default=3,
+                            help='Depth of the directories tree of the projects')
+    arg_parser.add_argument('--fan-out', type=int, default=4,
+                            help='Maximum number of the project references of a project')
+    arg_parser.add_argument('--conditional-ratio', type=float, default=0.2,
+                            help='Part of the imports with a condition')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    solution_filepath, config_filepath, _ = generate_tree(
+        args.root_dir, args.projects, args.props, args.depth, args.fan_out,
+        args.conditional_ratio, args.seed)
+
+    print(solution_filepath)
+    print(config_filepath)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+@echo off
+
+REM Pre-scan benchmark for the 'Import' dependencies of
+REM https://github.com/Microsoft/PTVS
+
+set "PYTHONEXE=G:\Installed\Python37\python.exe"
+
+call %PYTHONEXE% ../../benchmarks/prescan_benchmark.py ^
+    --sln "../../../others/PTVS/Python/PythonTools.sln" ^
+    --dep-item Import ^
+    --config projects_config.ini
@@ -3,11 +3,12 @@
 REM Example for
 REM https://github.com/Microsoft/PTVS
 
-set "PYTHONEXE=G:\Installed\Python36\python.exe"
+set "PYTHONPATH=%PYTHONPATH%;../../src"
+set "PYTHONEXE=G:\Installed\Python37\python.exe"
 set "GRAPHVIZ_BIN_PATH=G:\Installed\Graphviz2.38\bin"
 set "PATH=%PATH%;%GRAPHVIZ_BIN_PATH%"
 
-call %PYTHONEXE% ../../src/pdv.py ^
+call %PYTHONEXE% -m pdv ^
     --sln "../../../others/PTVS/Python/PythonTools.sln" ^
     --dep-item ProjectReference ProjectReference2 ^
     --config projects_config.ini ^
@@ -15,14 +16,14 @@ call %PYTHONEXE% ../../src/pdv.py ^
     --outfilename ptvs_full_dependencies.dot ^
     --outdir generated
 
-call %PYTHONEXE% ../../src/pdv.py ^
+call %PYTHONEXE% -m pdv ^
     --proj "../../../others/PTVS/Python/Product/Core/Core.csproj" ^
     --dep-item ProjectReference ^
     --with-render ^
     --outfilename ptvs_core_dependencies.dot ^
     --outdir generated
 
-call %PYTHONEXE% ../../src/pdv.py ^
+call %PYTHONEXE% -m pdv ^
     --sln "../../../others/PTVS/Python/PythonTools.sln" ^
     --dep-item Import ^
     --with-render ^
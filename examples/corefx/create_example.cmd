@@ -3,11 +3,12 @@
 REM Example for
 REM https://github.com/dotnet/corefx
 
-set "PYTHONEXE=G:\Installed\Python36\python.exe"
+set "PYTHONPATH=%PYTHONPATH%;../../src"
+set "PYTHONEXE=G:\Installed\Python37\python.exe"
 set "GRAPHVIZ_BIN_PATH=G:\Installed\Graphviz2.38\bin"
 set "PATH=%PATH%;%GRAPHVIZ_BIN_PATH%"
 
-call %PYTHONEXE% ../../src/pdv.py ^
+call %PYTHONEXE% -m pdv ^
     --sln "../../../others/corefx/src/System.Data.Common/System.Data.Common.sln" ^
     --dep-item ProjectReference ^
     --with-render ^
@@ -15,7 +16,7 @@ call %PYTHONEXE% ../../src/pdv.py ^
     --outdir generated ^
     --config projects_config.ini
 
-call %PYTHONEXE% ../../src/pdv.py ^
+call %PYTHONEXE% -m pdv ^
     --proj "../../../others/corefx/src/System.Net.WebSockets/ref/System.Net.WebSockets.csproj" ^
     --dep-item ProjectReference ^
     --with-render ^
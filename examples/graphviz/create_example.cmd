@@ -3,11 +3,12 @@
 REM Example for
 REM https://gitlab.com/graphviz/graphviz.git
 
-set "PYTHONEXE=G:\Installed\Python36\python.exe"
+set "PYTHONPATH=%PYTHONPATH%;../../src"
+set "PYTHONEXE=G:\Installed\Python37\python.exe"
 set "GRAPHVIZ_BIN_PATH=G:\Installed\Graphviz2.38\bin"
 set "PATH=%PATH%;%GRAPHVIZ_BIN_PATH%"
 
-call %PYTHONEXE% ../../src/pdv.py ^
+call %PYTHONEXE% -m pdv ^
     --sln "../../../others/graphviz/.build/Graphviz.sln" ^
     --dep-item ProjectReference ^
     --with-render ^
@@ -1,6 +1,6 @@
 @echo off
 
 set PYTHONPATH=%PYTHONPATH%;../src/
-set PYTHONEXE=G:\Installed\Python36\python.exe
+set PYTHONEXE=G:\Installed\Python37\python.exe
 
 call %PYTHONEXE% traverse_for_solutions.py %*
@@ -5,18 +5,19 @@ import pdv
 
 
 def traverse_for_solutions(root_dir):
-    num = 0
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.lower().endswith('.sln'):
-                num += 1
-                params_list = ['--sln', os.path.join(root, file),
-                               '--dep-item', 'ProjectReference', 'ProjectReference2',
-                               '--outdir', '.out_solutions',
-                               '--outfilename', file + '_ProjectReference_' + str(num) + '.dot',
-                                '--with-render'
-                              ]
-                pdv.print_dependencies(params_list)
+    # bin, obj, .git, etc directories are not visited
+    walker = pdv.ProjectFilesWalker(find_solutions=True)
+    solution_files = (filepath for filepath in walker.walk([root_dir])
+                      if pdv.is_solution_file(filepath))
+    for num, solution_file in enumerate(solution_files, 1):
+        file = os.path.basename(solution_file)
+        params_list = ['--sln', solution_file,
+                       '--dep-item', 'ProjectReference', 'ProjectReference2',
+                       '--outdir', '.out_solutions',
+                       '--outfilename', file + '_ProjectReference_' + str(num) + '.dot',
+                        '--with-render'
+                      ]
+        pdv.print_dependencies(params_list)
 
 
 if __name__ == '__main__':
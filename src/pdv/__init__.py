@@ -0,0 +1,76 @@
+'''MSBuild projects dependencies visualizer.
+
+The package modules are imported on the first access to their attributes,
+so "import pdv" is cheap and the graphviz module is imported only for rendering.
+'''
+import importlib
+
+
+_global_lazy_attributes = {
+    'get_string_variables': 'pdv.context',
+    'parse_config': 'pdv.context',
+    'ProjectsContext': 'pdv.context',
+    'get_attribute_values': 'pdv.msbuild',
+    'is_standard_project': 'pdv.msbuild',
+    'MSBuildItems': 'pdv.msbuild',
+    'MSBuildItemDependencyInfo': 'pdv.msbuild',
+    'get_packages_config_references': 'pdv.msbuild',
+    'MSBuildXmlProject': 'pdv.msbuild',
+    'ProjectFilePrescanner': 'pdv.msbuild',
+    'DependenciesCollector': 'pdv.msbuild',
+    'DirectoryNode': 'pdv.directory_tree',
+    'DirectoryPathsBranch': 'pdv.directory_tree',
+    'build_directory_tree': 'pdv.directory_tree',
+    'get_collapsed_directories': 'pdv.directory_tree',
+    'print_directory_tree': 'pdv.directory_tree',
+    'ShardingMethods': 'pdv.sharding',
+    'get_directory_shards': 'pdv.sharding',
+    'get_min_cut_shards': 'pdv.sharding',
+    'get_default_pruned_directories': 'pdv.discovery',
+    'is_project_file': 'pdv.discovery',
+    'is_solution_file': 'pdv.discovery',
+    'ProjectFilesWalker': 'pdv.discovery',
+    'LayeredDigraph': 'pdv.layered_svg',
+    'PackageIndex': 'pdv.packages',
+    'build_package_index': 'pdv.packages',
+    'ProjectDependencyPrinter': 'pdv.printer',
+    'GraphVizSettings': 'pdv.settings',
+    'ProjectsSettings': 'pdv.settings',
+    'get_graph_dict': 'pdv.export',
+    'export_graph_json': 'pdv.export',
+    'OutputSettings': 'pdv.settings',
+    'get_strongly_connected_components': 'pdv.graph',
+    'condense_graph': 'pdv.graph',
+    'ReachabilityIndex': 'pdv.reachability',
+    'read_build_times': 'pdv.analytics',
+    'analyze_build': 'pdv.analytics',
+    'BuildAnalysis': 'pdv.analytics',
+    'GraphSnapshot': 'pdv.diff',
+    'GraphDiff': 'pdv.diff',
+    'load_graph_dict': 'pdv.diff',
+    'ProjectNode': 'pdv.api',
+    'DependencyGraph': 'pdv.api',
+    'collect_graph': 'pdv.api',
+    'parse_arguments': 'pdv.cli',
+    'print_dependencies': 'pdv.cli',
+    'run_command': 'pdv.cli',
+    'main': 'pdv.cli',
+}
+
+
+__all__ = sorted(_global_lazy_attributes)
+
+
+def __getattr__(name):
+    if name not in _global_lazy_attributes:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(importlib.import_module(_global_lazy_attributes[name]), name)
+    # next access does not come here
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_global_lazy_attributes))
@@ -0,0 +1,4 @@
+from pdv.cli import main
+
+
+main()
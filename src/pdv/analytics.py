@@ -0,0 +1,166 @@
+import os
+import csv
+import json
+import logging
+
+from pdv.graph import condense_graph
+
+
+def read_build_times(csv_filepath):
+    '''Returns {normalized project path: build time} from the csv file with rows
+       "project path,build time". Relative paths are relative to the csv file directory'''
+    csv_directory = os.path.dirname(os.path.abspath(csv_filepath))
+
+    build_times = {}
+    with open(csv_filepath, 'rt', newline='') as csv_file:
+        for row in csv.reader(csv_file):
+            if len(row) < 2 or not row[0].strip() or row[0].lstrip().startswith('#'):
+                continue
+
+            try:
+                build_time = float(row[1])
+            except ValueError:
+                # header
+                logging.debug('Skip build times row: %s', row)
+                continue
+
+            project_path = os.path.join(csv_directory, row[0].strip())
+            build_times[os.path.normpath(project_path).lower()] = build_time
+
+    return build_times
+
+
+class BuildAnalysis:
+    '''Parallelism of the build: projects are built by levels, a project of the level N
+       depends only on projects of the levels below N. Projects of a cycle are
+       accounted as a single project'''
+    def __init__(self, levels, critical_path, critical_path_length, total_weight, cycles,
+                 dependencies_count):
+        self.levels = levels
+        self.critical_path = critical_path
+        self.critical_path_length = critical_path_length
+        self.total_weight = total_weight
+        self.cycles = cycles
+        self.dependencies_count = dependencies_count
+
+    def get_max_concurrency(self):
+        return max((len(level) for level in self.levels), default=0)
+
+    def get_critical_path_dependencies(self):
+        '''Returns (project, dependency) pairs of the critical path'''
+        return set(zip(self.critical_path[1:], self.critical_path[:-1]))
+
+    def to_dict(self):
+        parallelism = self.total_weight / self.critical_path_length \
+            if self.critical_path_length else 0.0
+
+        return dict(
+            projects_count=sum(len(level) for level in self.levels),
+            dependencies_count=self.dependencies_count,
+            max_concurrency=self.get_max_concurrency(),
+            total_weight=self.total_weight,
+            critical_path=dict(
+                length=self.critical_path_length,
+                projects=[project.get_project_filepath() for project in self.critical_path]),
+            average_parallelism=parallelism,
+            levels=[dict(level=number,
+                         width=len(level),
+                         projects=sorted(project.get_project_filepath() for project in level))
+                    for number, level in enumerate(self.levels)],
+            cycles=[sorted(project.get_project_filepath() for project in cycle)
+                    for cycle in self.cycles])
+
+    def save_json(self, json_filepath):
+        json_directory = os.path.dirname(json_filepath)
+        if json_directory:
+            os.makedirs(json_directory, exist_ok=True)
+
+        with open(json_filepath, 'wt', encoding='utf-8') as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+
+        logging.info('Build analysis saved to [%s]', json_filepath)
+
+
+def analyze_build(projects, get_dependencies, build_times=None):
+    '''Returns BuildAnalysis of the projects.
+       get_dependencies(project) returns dependencies of the project to account.
+       build_times is {normalized project path: build time}, without it
+       every project takes 1. Projects missing in build_times take 0'''
+    # components of the dependencies come first, so it is a topological order
+    components, component_ids, get_successors = condense_graph(projects, get_dependencies)
+
+    def get_weight(project):
+        if build_times is None:
+            return 1.0
+        return build_times.get(os.path.normpath(project.get_project_filepath()).lower(), 0.0)
+
+    if build_times is not None:
+        missing_count = sum(1 for project in component_ids
+                            if os.path.normpath(project.get_project_filepath()).lower()
+                            not in build_times)
+        if missing_count:
+            logging.warning('No build times for %d projects', missing_count)
+
+    components_levels = []
+    # finish time of the component build when all dependencies are built before
+    components_finishes = []
+    # component of the dependency which is built the last
+    components_predecessors = []
+    dependencies_count = 0
+    cycles = []
+
+    for number, component in enumerate(components):
+        level = 0
+        start = 0.0
+        predecessor = None
+        is_cycle = len(component) > 1
+
+        for project in component:
+            for dependency in get_successors(project):
+                dependencies_count += 1
+                dependency_component = component_ids[dependency]
+                if dependency_component == number:
+                    # the project depends on itself
+                    is_cycle = True
+                    continue
+
+                level = max(level, components_levels[dependency_component] + 1)
+                if predecessor is None or components_finishes[dependency_component] > start:
+                    start = components_finishes[dependency_component]
+                    predecessor = dependency_component
+
+        if is_cycle:
+            cycles.append(sorted(component))
+
+        components_levels.append(level)
+        components_finishes.append(start + sum(get_weight(project) for project in component))
+        components_predecessors.append(predecessor)
+
+    levels = [[] for _ in range(max(components_levels, default=-1) + 1)]
+    for number, component in enumerate(components):
+        levels[components_levels[number]].extend(component)
+
+    critical_path = []
+    critical_path_length = 0.0
+    if components:
+        last_component = max(range(len(components)),
+                             key=lambda number: components_finishes[number])
+        critical_path_length = components_finishes[last_component]
+
+        component_number = last_component
+        while component_number is not None:
+            critical_path.extend(sorted(components[component_number], reverse=True))
+            component_number = components_predecessors[component_number]
+        # from the first built project to the last one
+        critical_path.reverse()
+
+    if cycles:
+        logging.warning('%d dependencies cycles found', len(cycles))
+
+    total_weight = sum(get_weight(project) for project in component_ids)
+    logging.info('%d build levels, max concurrency %d, critical path %d projects (%0.2f of %0.2f)',
+                 len(levels), max((len(level) for level in levels), default=0),
+                 len(critical_path), critical_path_length, total_weight)
+
+    return BuildAnalysis(levels, critical_path, critical_path_length, total_weight, cycles,
+                         dependencies_count)
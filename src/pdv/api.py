@@ -0,0 +1,129 @@
+import collections
+
+from pdv.settings import ProjectsSettings
+
+
+# project of the collected graph; output_types is a tuple of the project output types
+ProjectNode = collections.namedtuple('ProjectNode', ('id', 'path', 'exists', 'output_types'))
+
+
+class DependencyGraph:
+    '''Read-only graph of the collected projects.
+
+       Projects are sorted by their path and numbered in this order (as in the
+       json export), a dependency is a (project, dependency project) pair of nodes.
+       Nothing is written until one of the output methods is called'''
+    def __init__(self, projects_settings, existing_projects, unknown_projects):
+        from pdv.export import get_graph_dict
+
+        self._projects_settings = projects_settings
+        self._existing_projects = existing_projects
+        self._unknown_projects = unknown_projects
+
+        graph_dict = get_graph_dict(projects_settings, existing_projects, unknown_projects)
+        self._root = graph_dict['root']
+        self._nodes = tuple(ProjectNode(project['id'], project['path'], project['exists'],
+                                        tuple(project['output_types']))
+                            for project in graph_dict['projects'])
+        self._edges = tuple((tail_id, head_id)
+                            for tail_id, head_id in graph_dict['dependencies'])
+
+        self._nodes_ids = dict((node.path.lower(), node.id) for node in self._nodes)
+        self._successors = [[] for _ in self._nodes]
+        self._predecessors = [[] for _ in self._nodes]
+        for tail_id, head_id in self._edges:
+            self._successors[tail_id].append(head_id)
+            self._predecessors[head_id].append(tail_id)
+
+    def get_root(self):
+        '''Returns the directory of the solutions, of the discovery roots
+           or the current directory, the projects paths of the json export are relative to'''
+        return self._root
+
+    def get_nodes_count(self):
+        return len(self._nodes)
+
+    def get_edges_count(self):
+        return len(self._edges)
+
+    def get_nodes(self):
+        return iter(self._nodes)
+
+    def get_edges(self):
+        '''Yields (project, dependency project) pairs'''
+        for tail_id, head_id in self._edges:
+            yield self._nodes[tail_id], self._nodes[head_id]
+
+    def get_node(self, node_id):
+        return self._nodes[node_id]
+
+    def find_node(self, project_path):
+        '''Returns the node of the project (case insensitive) or None'''
+        node_id = self._nodes_ids.get(project_path.lower())
+        return None if node_id is None else self._nodes[node_id]
+
+    def get_dependencies(self, node):
+        return (self._nodes[head_id] for head_id in self._successors[node.id])
+
+    def get_dependents(self, node):
+        return (self._nodes[tail_id] for tail_id in self._predecessors[node.id])
+
+    def to_dict(self):
+        '''Returns the graph in the json export format'''
+        from pdv.export import get_graph_dict
+
+        return get_graph_dict(self._projects_settings, self._existing_projects,
+                              self._unknown_projects)
+
+    def export_json(self, json_filepath):
+        from pdv.export import export_graph_json
+
+        export_graph_json(self._projects_settings, self._existing_projects,
+                          self._unknown_projects, json_filepath)
+
+    def create_diagram(self, gv_settings):
+        '''Writes (and renders) the diagram described by pdv.GraphVizSettings'''
+        from pdv.printer import ProjectDependencyPrinter
+
+        printer = ProjectDependencyPrinter(self._projects_settings)
+        printer.create_collected_projects_diagram(self._existing_projects,
+                                                  self._unknown_projects, gv_settings)
+
+    def build_reachability_index(self):
+        from pdv.reachability import ReachabilityIndex
+
+        return ReachabilityIndex.build(self._existing_projects,
+                                       self._projects_settings.get_printed_dependencies)
+
+    def build_package_index(self):
+        '''Returns pdv.PackageIndex of the existing projects
+           (collect_graph should be called with collect_packages=True)'''
+        from pdv.packages import build_package_index
+
+        return build_package_index(self._existing_projects)
+
+    def analyze_build(self, build_times=None):
+        '''Returns pdv.BuildAnalysis, build_times is {normalized project path: build time}'''
+        from pdv.analytics import analyze_build
+
+        return analyze_build(self._existing_projects,
+                             self._projects_settings.get_printed_dependencies,
+                             build_times)
+
+
+def collect_graph(dependencies_info, projects=None, solutions=None, discover_roots=None,
+                  config=None, variables=None, ignore_std=False, ignore_deps=None,
+                  use_prescan=True, collect_packages=False):
+    '''Collects the projects dependencies in-process and returns DependencyGraph.
+
+       dependencies_info is a list of pdv.MSBuildItemDependencyInfo, projects,
+       solutions and discover_roots are lists of paths like --proj, --sln and
+       --discover-root arguments. variables {'$(Name)': value} override the ones
+       read from the ini-config file'''
+    projects_settings = ProjectsSettings(projects, solutions, dependencies_info, config,
+                                         ignore_std, ignore_deps, use_prescan,
+                                         discover_roots=discover_roots,
+                                         collect_packages=collect_packages)
+    existing_projects, unknown_projects = projects_settings.collect_projects(variables)
+
+    return DependencyGraph(projects_settings, existing_projects, unknown_projects)
@@ -0,0 +1,475 @@
+import sys
+import logging
+import time
+
+from pdv.msbuild import MSBuildItems, MSBuildItemDependencyInfo
+from pdv.settings import ProjectsSettings, GraphVizSettings, OutputSettings
+from pdv.sharding import ShardingMethods
+from pdv.discovery import ProjectFilesWalker, get_default_pruned_directories
+
+
+# graphviz arguments which ask for the diagram together with the outputs
+_global_diagram_arguments = (
+    'name',
+    'comment',
+    'label',
+    'outfilename',
+    'outdir',
+    'outformat',
+    'engine',
+    'need_render',
+    'hide_paths',
+    'max_nodes',
+    'collapse_depth',
+    'shard_by',
+    'highlight_critical_path',
+    'highlight_package_conflicts',
+    'native_render',
+    )
+
+
+def parse_arguments(args_list):
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        description='Print Visual Studio projects dependencies.')
+
+    projects_group = arg_parser.add_argument_group(
+        'Projects', 'Arguments for printing a project dependencies')
+    graphviz_group = arg_parser.add_argument_group(
+        'Graphviz', 'Arguments for the graphviz')
+    output_group = arg_parser.add_argument_group(
+        'Output', 'Outputs of the collected dependencies made instead of the graphviz source '
+                  '(together with it when any graphviz argument is given)')
+
+    projects_group.add_argument('--proj',
+                                metavar='ProjectFilePath',
+                                action='append')
+    projects_group.add_argument('--sln',
+                                metavar='SolutionFilePath',
+                                action='append')
+    projects_group.add_argument('--discover-root',
+                                metavar='DirectoryPath',
+                                action='append',
+                                help='Find all the "*proj" files under the directory')
+    projects_group.add_argument('--discover-solutions',
+                                action='store_true',
+                                help='Find also the "*.sln" files under --discover-root '
+                                     'and take their projects')
+    projects_group.add_argument('--prune-dirs',
+                                nargs='*',
+                                metavar='DirectoryName',
+                                default=get_default_pruned_directories(),
+                                help='Names of the directories which are not visited by the '
+                                     'discovery. Default: %(default)s')
+    projects_group.add_argument('--discover-threads', type=int,
+                                help='Number of threads scanning the directories '
+                                     'during the discovery')
+    projects_group.add_argument('--dep-item',
+                                nargs='+',
+                                choices=[t.value for t in MSBuildItems],
+                                metavar=('Item1', 'Item2'),
+                                required=True,
+                                help='MSBuild xml item(s). '
+                                     'Possible items: %(choices)s')
+    projects_group.add_argument('--dep-masks',
+                                nargs='*',
+                                metavar='.file_extension',
+                                help='Dependency files extensions masks for the accounting. '
+                                'For example: ".targets" ".props" ".settings", etc')
+
+    projects_group.add_argument('--ignore-deps',
+                                metavar='ProjectFileName',
+                                action='append',
+                                help='Do not print dependenices for/from the project on the image')
+
+    config_help = r'ini-config file path. '\
+                  r'This file is used to resolve variables of the projects. '\
+                  r'Variables should be defined at [DEFAULT] section. '\
+                  r'For example: $(SolutionDir)=C:\SolutionDir\ '
+    projects_group.add_argument('--config',
+                                help=config_help)
+    std_proj_help = r'Ignore standard projects like'\
+                    r' "$(VCTargetsPath)\Microsoft.Cpp.Default.props",'\
+                    r' "$(UserRootDir)\Microsoft.Cpp.$(Platform).user.props"'\
+                    r' and "$(VCTargetsPath)\Microsoft.Cpp.targets"'
+    projects_group.add_argument('--ignore-std-proj',
+                                dest='ignore_std',
+                                action='store_true',
+                                help=std_proj_help)
+    projects_group.add_argument('--without-prescan',
+                                dest='use_prescan',
+                                action='store_false',
+                                help='Parse every project file even if a quick search '
+                                     'of its bytes finds no items of interest')
+    projects_group.add_argument('--packages', dest='collect_packages', action='store_true',
+                                help='Collect NuGet packages of the projects (PackageReference '
+                                     'items and packages.config files) and print every package '
+                                     'as a single node')
+    projects_group.add_argument('--build-times',
+                                metavar='CsvFilePath',
+                                help='csv file with rows "project path,build time" used as '
+                                     'projects weights for the build analysis. Relative paths '
+                                     'are relative to the csv file directory')
+
+    output_group.add_argument('--export-json',
+                              metavar='JsonFilePath',
+                              help='Save the collected dependencies graph to the json file')
+    output_group.add_argument('--save-impact-index',
+                              metavar='IndexFilePath',
+                              help='Save the reachability index of the projects to the numpy '
+                                   '*.npz file for the "affected" command (requires numpy)')
+    output_group.add_argument('--export-package-matrix',
+                              metavar='CsvFilePath',
+                              help='Save the project x package matrix of the referenced '
+                                   'versions to the csv file (implies --packages)')
+    output_group.add_argument('--analyze-build',
+                              metavar='JsonFilePath',
+                              help='Save the build parallelism analysis (levels of the '
+                                   'projects, maximum concurrency, critical path and '
+                                   'dependencies cycles) to the json file')
+
+    graphviz_group.add_argument('--name', default='Dependencies',
+                                help='Graph name used in the source code.')
+    graphviz_group.add_argument('--comment', default='Dependencies for projects',
+                                help='Comment added to the first line of the source.')
+    graphviz_group.add_argument('--label', default='Dependencies',
+                                help='Label of the graph in the image')
+    graphviz_group.add_argument('--outfilename', default='project_dependencies.gv',
+                                help="Filename for saving the source")
+    graphviz_group.add_argument('--outdir', default='.out',
+                                help="(Sub)directory for source saving and rendering")
+    graphviz_group.add_argument('--outformat', default='svg',
+                                help="Rendering output format ('pdf', 'png', ...)")
+    graphviz_group.add_argument('--engine', default='dot',
+                                help="Layout command used ('dot', 'neato', ...)")
+    graphviz_group.add_argument('--with-render', dest='need_render', action='store_true',
+                                help="Render the source *.gv file with the engine to an image")
+    graphviz_group.add_argument('--without-paths', dest='hide_paths', action='store_true',
+                                help='Do not add projects path to the image')
+    graphviz_group.add_argument('--max-nodes', type=int,
+                                help='Collapse directories into single nodes until the image '
+                                     'has no more than the given number of nodes')
+    graphviz_group.add_argument('--collapse-depth', type=int,
+                                help='Collapse directories at the given level below the common '
+                                     'directory of the projects (0 - the common directory '
+                                     'itself) into single nodes')
+    graphviz_group.add_argument('--shard-by',
+                                choices=[t.value for t in ShardingMethods],
+                                help='Split the image into several files: one per top-level '
+                                     'directory or --shards balanced shards with minimal '
+                                     'dependencies between them. Dependencies on the other '
+                                     'shards are printed as links. The --outfilename file '
+                                     'becomes an index of the shards')
+    graphviz_group.add_argument('--shards', dest='shards_count', type=int, default=4,
+                                help='Number of shards for "--shard-by %s"'
+                                     % ShardingMethods.BY_MIN_CUT.value)
+    graphviz_group.add_argument('--highlight-critical-path', action='store_true',
+                                help='Highlight the longest chain of the dependent projects '
+                                     '(see --build-times)')
+    graphviz_group.add_argument('--highlight-package-conflicts', action='store_true',
+                                help='Highlight packages referenced with different versions '
+                                     '(implies --packages)')
+    graphviz_group.add_argument('--native-render', action='store_true',
+                                help='Lay out the graph and write the svg image without graphviz. '
+                                     'It is much faster than dot for large graphs. '
+                                     '--engine and --with-render are ignored')
+
+    args = arg_parser.parse_args(args=args_list)
+
+    if not args.proj and not args.sln and not args.discover_root:
+        print('You should specify at least --proj, --sln or --discover-root parameter')
+        arg_parser.print_help()
+        sys.exit(1)
+
+    if args.max_nodes is not None and args.max_nodes < 2:
+        arg_parser.error('--max-nodes should be at least 2')
+    if args.collapse_depth is not None and args.collapse_depth < 0:
+        arg_parser.error('--collapse-depth should not be negative')
+    if args.shards_count < 1:
+        arg_parser.error('--shards should be at least 1')
+    if args.discover_threads is not None and args.discover_threads < 1:
+        arg_parser.error('--discover-threads should be at least 1')
+    if args.native_render and args.outformat != 'svg':
+        arg_parser.error('--native-render supports only the svg output format')
+
+    dependency_info_list = []
+    for item in args.dep_item:
+        dependency_info_list.append(MSBuildItemDependencyInfo(item, args.dep_masks))
+
+    proj_settings = ProjectsSettings(args.proj,
+                                     args.sln,
+                                     dependency_info_list,
+                                     args.config,
+                                     args.ignore_std,
+                                     args.ignore_deps,
+                                     args.use_prescan,
+                                     args.build_times,
+                                     args.discover_root,
+                                     ProjectFilesWalker(args.prune_dirs,
+                                                        args.discover_solutions,
+                                                        args.discover_threads),
+                                     args.collect_packages or
+                                     args.highlight_package_conflicts or
+                                     bool(args.export_package_matrix))
+
+    gv_settings = GraphVizSettings(args.name, args.comment, args.outfilename,
+                                   args.outdir, args.outformat, args.engine,
+                                   args.label, args.need_render, args.hide_paths,
+                                   args.max_nodes, args.collapse_depth,
+                                   ShardingMethods(args.shard_by) if args.shard_by else None,
+                                   args.shards_count,
+                                   args.highlight_critical_path,
+                                   args.native_render,
+                                   args.highlight_package_conflicts)
+
+    need_diagram = any(getattr(args, name) != arg_parser.get_default(name)
+                       for name in _global_diagram_arguments)
+
+    output_settings = OutputSettings(args.export_json, args.save_impact_index,
+                                     args.analyze_build, args.export_package_matrix,
+                                     need_diagram)
+
+    return proj_settings, gv_settings, output_settings
+
+
+def print_dependencies(args_list=None):
+    proj_settings, gv_settings, output_settings = parse_arguments(args_list)
+
+    if not output_settings.has_outputs():
+        from pdv.printer import ProjectDependencyPrinter
+
+        pdp = ProjectDependencyPrinter(proj_settings)
+        pdp.create_projects_diagram(gv_settings)
+        return
+
+    # the projects are collected once for all the outputs
+    existing_projects, unknown_projects = proj_settings.collect_projects()
+
+    if output_settings.json_filepath:
+        from pdv.export import export_graph_json
+
+        export_graph_json(proj_settings, existing_projects, unknown_projects,
+                          output_settings.json_filepath)
+
+    if output_settings.impact_index_filepath:
+        from pdv.reachability import ReachabilityIndex
+
+        reachability_index = ReachabilityIndex.build(existing_projects,
+                                                     proj_settings.get_printed_dependencies)
+        reachability_index.save(output_settings.impact_index_filepath)
+
+    if output_settings.build_analysis_filepath:
+        from pdv.analytics import analyze_build
+
+        build_analysis = analyze_build(existing_projects,
+                                       proj_settings.get_printed_dependencies,
+                                       proj_settings.get_build_times())
+        build_analysis.save_json(output_settings.build_analysis_filepath)
+
+    if output_settings.package_matrix_filepath:
+        from pdv.packages import build_package_index
+
+        package_index = build_package_index(existing_projects)
+        package_index.export_matrix_csv(output_settings.package_matrix_filepath)
+
+    if output_settings.need_diagram:
+        from pdv.printer import ProjectDependencyPrinter
+
+        pdp = ProjectDependencyPrinter(proj_settings)
+        pdp.create_collected_projects_diagram(existing_projects, unknown_projects, gv_settings)
+
+
+def parse_affected_arguments(args_list):
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog='pdv affected',
+        description='Print projects affected by the changed files using the index '
+                    'saved with --save-impact-index.')
+
+    arg_parser.add_argument('--index', metavar='IndexFilePath', required=True,
+                            help='Reachability index file')
+    arg_parser.add_argument('changed_files', metavar='ChangedFilePath', nargs='*',
+                            help='Changed file. A file belongs to the project from the '
+                                 'nearest parent directory of the file')
+    arg_parser.add_argument('--changed-files-list', metavar='ListFilePath',
+                            help='File with the changed files paths, one per line '
+                                 '("-" for the standard input)')
+    arg_parser.add_argument('--changed-root', metavar='DirectoryPath', default='.',
+                            help='Directory for the relative changed files paths '
+                                 '(default: the current directory)')
+    arg_parser.add_argument('--projects-only', action='store_true',
+                            help='Print only "*proj" files (no *.props, *.targets, etc)')
+    arg_parser.add_argument('--output', metavar='FilePath',
+                            help='Save the affected projects to the file instead of '
+                                 'the standard output')
+
+    return arg_parser.parse_args(args=args_list)
+
+
+def print_affected_projects(args_list):
+    import os
+    from pdv.reachability import ReachabilityIndex
+
+    args = parse_affected_arguments(args_list)
+
+    changed_files = list(args.changed_files)
+    if args.changed_files_list == '-':
+        changed_files += sys.stdin.read().splitlines()
+    elif args.changed_files_list:
+        with open(args.changed_files_list, 'rt') as list_file:
+            changed_files += list_file.read().splitlines()
+
+    changed_files = [os.path.abspath(os.path.join(args.changed_root, changed_file))
+                     for changed_file in changed_files if changed_file.strip()]
+
+    reachability_index = ReachabilityIndex.load(args.index)
+    affected_projects, unowned_files = reachability_index.get_affected_projects(changed_files)
+
+    for unowned_file in unowned_files:
+        logging.warning('File [%s] does not belong to any project', unowned_file)
+
+    if args.projects_only:
+        affected_projects = [project for project in affected_projects
+                             if project.lower().endswith('proj')]
+
+    logging.info('%d changed files affect %d projects', len(changed_files), len(affected_projects))
+
+    affected_text = ''.join(project + '\n' for project in affected_projects)
+    if args.output:
+        with open(args.output, 'wt') as output_file:
+            output_file.write(affected_text)
+    else:
+        sys.stdout.write(affected_text)
+
+
+def parse_diff_arguments(args_list):
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog='pdv diff',
+        description='Print added and removed projects and dependencies between two graphs. '
+                    'Every graph is a json file saved with --export-json or a directory '
+                    'with the projects sources.')
+
+    arg_parser.add_argument('old_graph', metavar='OldGraph',
+                            help='Json file or sources directory')
+    arg_parser.add_argument('new_graph', metavar='NewGraph',
+                            help='Json file or sources directory')
+    arg_parser.add_argument('--dep-item',
+                            nargs='+',
+                            choices=[t.value for t in MSBuildItems],
+                            metavar=('Item1', 'Item2'),
+                            default=[MSBuildItems.ITEM_PROJECT_REF.value,
+                                     MSBuildItems.ITEM_PROJECT_REF2.value],
+                            help='MSBuild xml item(s) for the sources directories. '
+                                 'Possible items: %(choices)s')
+    arg_parser.add_argument('--dep-masks',
+                            nargs='*',
+                            metavar='.file_extension',
+                            help='Dependency files extensions masks for the sources directories')
+    arg_parser.add_argument('--config',
+                            help='ini-config file path to resolve variables of the projects')
+    arg_parser.add_argument('--report', metavar='JsonFilePath',
+                            help='Save the added and removed projects and dependencies '
+                                 'to the json file')
+    arg_parser.add_argument('--outfilename', default='dependencies_diff.gv',
+                            help="Filename for saving the source")
+    arg_parser.add_argument('--outdir', default='.out',
+                            help="(Sub)directory for source saving and rendering")
+    arg_parser.add_argument('--outformat', default='svg',
+                            help="Rendering output format ('pdf', 'png', ...)")
+    arg_parser.add_argument('--engine', default='dot',
+                            help="Layout command used ('dot', 'neato', ...)")
+    arg_parser.add_argument('--with-render', dest='need_render', action='store_true',
+                            help="Render the source *.gv file with the engine to an image")
+    arg_parser.add_argument('--native-render', action='store_true',
+                            help='Lay out the graph and write the svg image without graphviz')
+
+    args = arg_parser.parse_args(args=args_list)
+
+    if args.native_render and args.outformat != 'svg':
+        arg_parser.error('--native-render supports only the svg output format')
+
+    return args
+
+
+def get_diff_graph_dict(graph_path, args):
+    '''Returns the graph from the json file or collected from the sources directory'''
+    import os
+    from pdv.diff import load_graph_dict
+
+    if not os.path.isdir(graph_path):
+        return load_graph_dict(graph_path)
+
+    from pdv.export import get_graph_dict
+
+    dependency_info_list = [MSBuildItemDependencyInfo(item, args.dep_masks)
+                            for item in args.dep_item]
+    # the discovery root is the root of the graph
+    proj_settings = ProjectsSettings(None, None, dependency_info_list, args.config,
+                                     False, None, discover_roots=[graph_path])
+    existing_projects, unknown_projects = proj_settings.collect_projects()
+
+    return get_graph_dict(proj_settings, existing_projects, unknown_projects)
+
+
+def print_graph_diff(args_list):
+    import json
+    from pdv.diff import GraphSnapshot, GraphDiff, print_graph_diff as print_diff_to_digraph
+    from pdv.printer import ProjectDependencyPrinter
+
+    args = parse_diff_arguments(args_list)
+
+    old_graph_dict = get_diff_graph_dict(args.old_graph, args)
+    new_graph_dict = get_diff_graph_dict(args.new_graph, args)
+
+    start_time = time.perf_counter()
+    old_snapshot = GraphSnapshot(old_graph_dict)
+    new_snapshot = GraphSnapshot(new_graph_dict)
+    graph_diff = GraphDiff(old_snapshot, new_snapshot)
+    logging.info('Graphs compared in %0.4f secs', time.perf_counter() - start_time)
+
+    if args.report:
+        with open(args.report, 'wt', encoding='utf-8') as report_file:
+            json.dump(graph_diff.to_dict(), report_file, indent=2)
+
+    gv_settings = GraphVizSettings('Dependencies_diff', 'Dependencies diff', args.outfilename,
+                                   args.outdir, args.outformat, args.engine,
+                                   '{} -> {}'.format(args.old_graph, args.new_graph).replace(
+                                       '\\', '/'),
+                                   args.need_render, False,
+                                   native_render=args.native_render)
+    digraph_object = ProjectDependencyPrinter.create_digraph(
+        gv_settings, gv_settings.filename, gv_settings.diagram_label)
+    print_diff_to_digraph(graph_diff, digraph_object)
+    ProjectDependencyPrinter.output_digraphs([digraph_object], gv_settings.need_render)
+
+
+# commands which are run instead of the printing dependencies
+_global_commands = {
+    'affected': print_affected_projects,
+    'diff': print_graph_diff,
+}
+
+
+def run_command(args_list=None):
+    '''Runs the command given by the first argument or prints dependencies'''
+    if args_list is None:
+        args_list = sys.argv[1:]
+
+    if args_list and args_list[0] in _global_commands:
+        _global_commands[args_list[0]](args_list[1:])
+    else:
+        print_dependencies(args_list)
+
+
+def main():
+    logging_format = '%(asctime)s %(levelname)s: %(message)s'
+    logging.basicConfig(format=logging_format, level=logging.DEBUG)
+
+    start_time = time.perf_counter()
+    run_command()
+    end_time = time.perf_counter()
+    logging.info('Total time spent: %0.7f secs', end_time - start_time)
@@ -0,0 +1,39 @@
+import re
+
+
+# TODO: sometimes variables may contain another variables within yourself
+# Need consider this case
+def get_string_variables(string):
+    return re.findall(r'\$\(.+?\)', string)
+
+
+def parse_config(config_filepath):
+    '''Returns variables defined at the [DEFAULT] section of the ini-config file'''
+    import configparser
+
+    projects_config = configparser.ConfigParser()
+    # prevent ignoring case sensitivity
+    projects_config.optionxform = lambda option: option
+    projects_config.read(config_filepath)
+
+    return dict(projects_config['DEFAULT'])
+
+
+class ProjectsContext:
+    '''State of a single run shared by all the projects found during the run:
+       variables to resolve in the projects paths and the project files pre-scanner'''
+    def __init__(self, variables=None, prescanner=None):
+        self.variables = dict(variables) if variables else {}
+        self.prescanner = prescanner
+
+    def try_resolve_variables(self, string_to_resolve):
+        '''Search for variable in self.variables and replace if it found'''
+        result = string_to_resolve
+
+        # TODO: consider using project's own section in the config for its own variables
+        variables = get_string_variables(string_to_resolve)
+        for var in variables:
+            if self.variables.get(var):
+                result = result.replace(var, self.variables[var])
+
+        return result
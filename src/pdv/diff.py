@@ -0,0 +1,204 @@
+import os
+import json
+import array
+import logging
+
+
+def _get_sorted_difference(sorted_values, other_sorted_values):
+    '''Returns values from sorted_values missing in other_sorted_values (both are sorted)'''
+    difference = array.array('q')
+    other_index = 0
+    other_count = len(other_sorted_values)
+
+    for value in sorted_values:
+        while other_index < other_count and other_sorted_values[other_index] < value:
+            other_index += 1
+        if other_index == other_count or other_sorted_values[other_index] != value:
+            difference.append(value)
+
+    return difference
+
+
+class GraphSnapshot:
+    '''Projects graph in the format of pdv.export.get_graph_dict.
+       Projects are identified by their paths relative to the graph root (case insensitive),
+       so snapshots of different copies of the sources can be compared'''
+    def __init__(self, graph_dict):
+        self.root = graph_dict.get('root')
+
+        projects_paths = dict((project['id'], project['path'])
+                              for project in graph_dict['projects'])
+        # not found projects keep paths from the referencing project as is
+        for tail_id, head_id in graph_dict['dependencies']:
+            head_path = projects_paths[head_id]
+            if not os.path.isabs(head_path):
+                projects_paths[head_id] = os.path.join(
+                    os.path.dirname(projects_paths[tail_id]), head_path)
+
+        self.paths = {}
+        self.existing_keys = set()
+        keys = {}
+        for project in graph_dict['projects']:
+            key = self._get_project_key(projects_paths[project['id']])
+            self.paths[key] = project['path']
+            if project['exists']:
+                self.existing_keys.add(key)
+            keys[project['id']] = key
+
+        self.keys = list(keys.values())
+        self.dependencies = [(keys[tail_id], keys[head_id])
+                             for tail_id, head_id in graph_dict['dependencies']]
+
+    def _get_project_key(self, project_path):
+        if self.root and os.path.isabs(project_path):
+            try:
+                project_path = os.path.relpath(project_path, self.root)
+            except ValueError:
+                # another drive
+                pass
+
+        return os.path.normpath(project_path).replace('\\', '/').lower()
+
+
+def load_graph_dict(json_filepath):
+    '''Returns the graph saved with --export-json'''
+    with open(json_filepath, 'rt', encoding='utf-8') as json_file:
+        return json.load(json_file)
+
+
+class GraphDiff:
+    '''Difference between two snapshots. Projects keys are interned into numbers
+       and every dependency is encoded as a single number, so the dependencies
+       are compared as sorted arrays of numbers'''
+    def __init__(self, old_snapshot, new_snapshot):
+        self.old_snapshot = old_snapshot
+        self.new_snapshot = new_snapshot
+
+        self.keys = sorted(set(old_snapshot.keys) | set(new_snapshot.keys))
+        self._ids = dict((key, number) for number, key in enumerate(self.keys))
+
+        self.old_dependencies = self._get_encoded_dependencies(old_snapshot)
+        self.new_dependencies = self._get_encoded_dependencies(new_snapshot)
+
+        # a project is added or removed when its file appears or disappears
+        old_ids = array.array('q', sorted(self._ids[key] for key in old_snapshot.existing_keys))
+        new_ids = array.array('q', sorted(self._ids[key] for key in new_snapshot.existing_keys))
+
+        self.added_projects = _get_sorted_difference(new_ids, old_ids)
+        self.removed_projects = _get_sorted_difference(old_ids, new_ids)
+        self.added_dependencies = _get_sorted_difference(self.new_dependencies,
+                                                         self.old_dependencies)
+        self.removed_dependencies = _get_sorted_difference(self.old_dependencies,
+                                                           self.new_dependencies)
+
+        logging.info('Projects: %d added, %d removed. Dependencies: %d added, %d removed',
+                     len(self.added_projects), len(self.removed_projects),
+                     len(self.added_dependencies), len(self.removed_dependencies))
+
+    def _get_encoded_dependencies(self, snapshot):
+        keys_count = len(self.keys)
+        return array.array('q', sorted(set(
+            self._ids[tail_key] * keys_count + self._ids[head_key]
+            for tail_key, head_key in snapshot.dependencies)))
+
+    def decode_dependency(self, dependency):
+        return divmod(dependency, len(self.keys))
+
+    def has_changes(self):
+        return bool(self.added_projects or self.removed_projects or
+                    self.added_dependencies or self.removed_dependencies)
+
+    def get_path(self, project_id):
+        key = self.keys[project_id]
+        if key in self.old_snapshot.existing_keys and \
+                key not in self.new_snapshot.existing_keys:
+            return self.old_snapshot.paths[key]
+
+        return self.new_snapshot.paths.get(key) or self.old_snapshot.paths[key]
+
+    def get_changed_projects(self):
+        '''Returns ids of the added and removed projects and of the projects
+           with added or removed dependencies'''
+        changed_projects = set(self.added_projects)
+        changed_projects.update(self.removed_projects)
+        for dependency in self.added_dependencies + self.removed_dependencies:
+            changed_projects.update(self.decode_dependency(dependency))
+
+        return changed_projects
+
+    def get_context_dependencies(self):
+        '''Returns not changed dependencies of the changed projects (one hop context)'''
+        changed_projects = self.get_changed_projects()
+
+        context_dependencies = []
+        for dependency in self.new_dependencies:
+            tail_id, head_id = self.decode_dependency(dependency)
+            if tail_id in changed_projects or head_id in changed_projects:
+                context_dependencies.append(dependency)
+
+        # added dependencies are not the context
+        return _get_sorted_difference(context_dependencies, self.added_dependencies)
+
+    def to_dict(self):
+        def get_dependencies_list(dependencies):
+            return [[self.get_path(tail_id), self.get_path(head_id)]
+                    for tail_id, head_id in map(self.decode_dependency, dependencies)]
+
+        return dict(added_projects=[self.get_path(project_id)
+                                    for project_id in self.added_projects],
+                    removed_projects=[self.get_path(project_id)
+                                      for project_id in self.removed_projects],
+                    added_dependencies=get_dependencies_list(self.added_dependencies),
+                    removed_dependencies=get_dependencies_list(self.removed_dependencies))
+
+
+_global_added_style = dict(
+    color='green3',
+    penwidth='3',
+    )
+
+
+_global_removed_style = dict(
+    color='red',
+    style='dashed',
+    penwidth='3',
+    )
+
+
+_global_context_style = dict(
+    color='grey',
+    )
+
+
+def print_graph_diff(graph_diff, digraph_object):
+    '''Prints the changed projects and dependencies with their one hop context'''
+    context_dependencies = graph_diff.get_context_dependencies()
+
+    added_projects = set(graph_diff.added_projects)
+    removed_projects = set(graph_diff.removed_projects)
+    changed_projects = graph_diff.get_changed_projects()
+
+    printed_projects = set(changed_projects)
+    for dependency in context_dependencies:
+        printed_projects.update(graph_diff.decode_dependency(dependency))
+
+    for project_id in sorted(printed_projects):
+        project_path = graph_diff.get_path(project_id)
+        node_style = dict(tooltip=project_path)
+        if project_id in added_projects:
+            node_style.update(_global_added_style)
+        elif project_id in removed_projects:
+            node_style.update(_global_removed_style)
+        elif project_id not in changed_projects:
+            node_style.update(_global_context_style)
+
+        digraph_object.node('node' + str(project_id),
+                            os.path.basename(project_path.replace('\\', '/')),
+                            **node_style)
+
+    for dependencies, edge_style in ((context_dependencies, _global_context_style),
+                                     (graph_diff.removed_dependencies, _global_removed_style),
+                                     (graph_diff.added_dependencies, _global_added_style)):
+        for dependency in dependencies:
+            tail_id, head_id = graph_diff.decode_dependency(dependency)
+            digraph_object.edge('node' + str(tail_id), 'node' + str(head_id), **edge_style)
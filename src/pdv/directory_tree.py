@@ -0,0 +1,225 @@
+import os
+import pathlib
+import heapq
+import logging
+
+
+class DirectoryNode:
+    def __init__(self, directory_name):
+        self.directory_name = directory_name
+        self.parent = None
+        self.childrens = []
+        self.items_in_directory = []
+
+    def __str__(self):
+        return self.get_directory_name()
+
+    def add_child(self, child):
+        child._set_parent(self)
+        self.childrens.append(child)
+
+    def _set_parent(self, parent):
+        self.parent = parent
+
+    def add_item_to_directory(self, item):
+        self.items_in_directory.append(item)
+
+    def is_root(self):
+        return True if not self.parent else False
+
+    def get_directory_name(self):
+        return self.directory_name
+
+    def get_all_items(self):
+        '''Returns items of this directory and all its subdirectories'''
+        items = list(self.items_in_directory)
+        for child in self.childrens:
+            items.extend(child.get_all_items())
+
+        return items
+
+
+class DirectoryPathsBranch:
+    def __init__(self):
+        self.nodes = []
+
+    def _add_node(self, directory_path):
+        parent_node = self.nodes[-1]
+        new_node = DirectoryNode(directory_path)
+        parent_node.add_child(new_node)
+        self.nodes.append(new_node)
+
+    def add_node(self, directory_path):
+        directory_path_obj = pathlib.PurePath(directory_path)
+
+        if self.nodes:
+            last_node_obj = pathlib.PurePath(self.nodes[-1].get_directory_name())
+
+            if last_node_obj == directory_path_obj:
+                logging.info("Path [%s] already added to the branch", str(last_node_obj))
+                return
+
+            if last_node_obj not in directory_path_obj.parents:
+                raise Exception('Incorrect directory path [{0}] for '
+                                'the current paths branch=[{1}]'.format(
+                                    directory_path, str(last_node_obj)))
+
+            # search for parent position in the parent list
+            number_parents_not_in_list = 0
+            while directory_path_obj.parents[number_parents_not_in_list] != last_node_obj:
+                number_parents_not_in_list += 1
+
+            # add parents of the directory_path to the branch
+            while number_parents_not_in_list != 0:
+                self._add_node(str(directory_path_obj.parents[number_parents_not_in_list - 1]))
+                number_parents_not_in_list -= 1
+
+            # add directory yourself to the branch
+            self._add_node(directory_path)
+
+        else:
+            self.nodes.append(DirectoryNode(directory_path))
+
+    def get_tip(self):
+        return self.nodes[-1] if self.nodes else None
+
+    def get_root(self):
+        return self.nodes[0] if self.nodes else None
+
+    def can_grow_to(self, directory_path_grow_to):
+        last_node = self.get_tip()
+        last_node_dir = pathlib.PurePath(last_node.get_directory_name())
+
+        directory_path_grow_to_obj = pathlib.PurePath(directory_path_grow_to)
+        can_grow = True if last_node_dir in directory_path_grow_to_obj.parents else False
+
+        return can_grow
+
+    def truncate_until(self, directory_path):
+        directory_path_obj = pathlib.PurePath(directory_path)
+
+        while pathlib.PurePath(self.nodes[-1].get_directory_name()) != directory_path_obj:
+            del self.nodes[-1]
+
+
+def build_directory_tree(projects):
+    if not projects:
+        return None
+
+    common_directory_path = os.path.commonpath(
+        [project.get_project_filepath() for project in projects])
+
+    # when len(projects) == 1 common_directory_path is a project file path, not a directory
+    if len(projects) == 1:
+        common_directory_path = os.path.dirname(common_directory_path)
+
+    tree_branch = DirectoryPathsBranch()
+    tree_branch.add_node(common_directory_path)
+
+    projects_sorted = sorted(list(projects))
+
+    for project in projects_sorted:
+        # parent node always is a last item in the list
+        tip_node = tree_branch.get_tip()
+        tip_node_dir = pathlib.PurePath(tip_node.get_directory_name())
+        project_dir = pathlib.PurePath(project.get_project_directory())
+        if project_dir == tip_node_dir:
+            # project is situated in the current directory
+            tip_node.add_item_to_directory(project)
+            continue
+
+        if not tree_branch.can_grow_to(project_dir):
+            # the project is located in another sub branch
+            common_path = os.path.commonpath((project_dir, tip_node_dir))
+            tree_branch.truncate_until(common_path)
+
+        # grow branch
+        tree_branch.add_node(project.get_project_directory())
+
+        tip_node = tree_branch.get_tip()
+        tip_node.add_item_to_directory(project)
+
+    return tree_branch.get_root()
+
+
+def get_collapsed_directories(root_node, max_nodes=None, collapse_depth=None, reserved_nodes=0):
+    '''Returns a list of directory nodes which should be printed as single aggregate nodes.
+
+       Directories are expanded from the root level by level (smaller ones first)
+       while the number of printed nodes (plus reserved_nodes) does not exceed max_nodes.
+       Directories at the collapse_depth level (root is 0) are never expanded.'''
+    if not root_node:
+        return []
+
+    items_counts = {}
+
+    def count_items(directory_node):
+        count = len(directory_node.items_in_directory)
+        for child in directory_node.childrens:
+            count += count_items(child)
+        items_counts[directory_node] = count
+        return count
+
+    count_items(root_node)
+
+    # directory with a single item is printed as that item
+    if items_counts[root_node] < 2:
+        return []
+
+    def get_expand_cost(directory_node):
+        # the aggregate node is replaced by the directory items and its non-empty childrens
+        return len(directory_node.items_in_directory) - 1 + sum(
+            1 for child in directory_node.childrens if items_counts[child])
+
+    collapsed = []
+    nodes_count = 1 + reserved_nodes
+    # (depth, expand cost, order) keeps heap ordering stable
+    candidates = [(0, get_expand_cost(root_node), 0, root_node)]
+    order = 1
+
+    while candidates:
+        depth, expand_cost, _, directory_node = heapq.heappop(candidates)
+
+        can_expand = collapse_depth is None or depth < collapse_depth
+        if can_expand and max_nodes is not None:
+            can_expand = nodes_count + expand_cost <= max_nodes
+
+        if not can_expand:
+            collapsed.append(directory_node)
+            continue
+
+        nodes_count += expand_cost
+        for child in directory_node.childrens:
+            if items_counts[child] > 1:
+                heapq.heappush(candidates, (depth + 1, get_expand_cost(child), order, child))
+                order += 1
+
+    logging.info('%d directories collapsed, %d nodes to print', len(collapsed), nodes_count)
+
+    return collapsed
+
+
+def print_node_items(directory_node):
+    if directory_node.items_in_directory:
+        print('Node items:\n\t{}'.format(
+            '\n\t'.join((str(item) for item in directory_node.items_in_directory))))
+
+
+def print_node(directory_node, print_childrens=False):
+    if print_childrens:
+        print('NODE\n{}\n\tCHILDRENS\n\t{}'.format(
+            directory_node,
+            '\n\t'.join((str(node) for node in directory_node.childrens))))
+    else:
+        print('NODE\n{}'.format(directory_node))
+
+
+def print_directory_tree(root_node):
+    if not root_node:
+        return
+
+    print_node(root_node)
+    print_node_items(root_node)
+
+    for child in root_node.childrens:
+        print_directory_tree(child)
@@ -0,0 +1,105 @@
+import os
+import logging
+
+
+# build outputs, packages and version control directories
+# which may hold a lot of files and never hold the sources projects
+_global_pruned_directories = (
+    '.git',
+    '.hg',
+    '.svn',
+    '.vs',
+    'bin',
+    'obj',
+    'node_modules',
+    'packages',
+    )
+
+
+def get_default_pruned_directories():
+    return list(_global_pruned_directories)
+
+
+def is_project_file(filename):
+    return filename.lower().endswith('proj')
+
+
+def is_solution_file(filename):
+    return filename.lower().endswith('.sln')
+
+
+class ProjectFilesWalker:
+    '''Looks for the project (and optionally solution) files under the directories.
+       Directories are scanned in parallel by a pool of threads and the found files
+       are yielded as soon as they are found. Directories with the pruned names
+       (case insensitive) and symbolic links to directories are not visited'''
+    def __init__(self, pruned_directories=_global_pruned_directories, find_solutions=False,
+                 max_workers=None):
+        self.pruned_directories = set(name.lower() for name in pruned_directories)
+        self.find_solutions = find_solutions
+        self.max_workers = max_workers
+
+        self.scanned_directories = 0
+        self.pruned_directories_count = 0
+        self.found_files = 0
+
+    def _is_file_of_interest(self, filename):
+        return is_project_file(filename) or \
+            (self.find_solutions and is_solution_file(filename))
+
+    def _scan_directory(self, directory):
+        '''Returns (found files, subdirectories to scan, number of pruned subdirectories)'''
+        files = []
+        subdirectories = []
+        pruned_count = 0
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() in self.pruned_directories:
+                                pruned_count += 1
+                            else:
+                                subdirectories.append(entry.path)
+                        elif self._is_file_of_interest(entry.name) and entry.is_file():
+                            files.append(entry.path)
+                    except OSError:
+                        # the entry is removed or not accessible
+                        continue
+        except OSError as error:
+            logging.warning('Failed to scan the directory [%s]: %s', directory, error)
+
+        return files, subdirectories, pruned_count
+
+    def walk(self, root_directories):
+        '''Yields absolute paths of the found files'''
+        import concurrent.futures
+
+        executor = concurrent.futures.ThreadPoolExecutor(self.max_workers)
+        pending_scans = set(executor.submit(self._scan_directory, os.path.abspath(root))
+                            for root in root_directories)
+        try:
+            while pending_scans:
+                done_scans, pending_scans = concurrent.futures.wait(
+                    pending_scans, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for scan in done_scans:
+                    files, subdirectories, pruned_count = scan.result()
+                    self.scanned_directories += 1
+                    self.pruned_directories_count += pruned_count
+                    # scan the subdirectories while the found files are processed
+                    pending_scans.update(executor.submit(self._scan_directory, subdirectory)
+                                         for subdirectory in subdirectories)
+
+                    for filepath in files:
+                        self.found_files += 1
+                        yield filepath
+        finally:
+            # the walk may be stopped before the end
+            for scan in pending_scans:
+                scan.cancel()
+            executor.shutdown()
+
+        logging.info('Discovery: %d files found, %d directories scanned, %d directories pruned',
+                     self.found_files, self.scanned_directories, self.pruned_directories_count)
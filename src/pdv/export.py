@@ -0,0 +1,50 @@
+import os
+import json
+import logging
+
+
+_global_graph_format_version = 1
+
+
+def get_graph_dict(projects_settings, existing_projects, unknown_projects):
+    '''Returns the collected projects graph as a dictionary of plain python types.
+       Projects are sorted by their path and numbered in this order'''
+    projects = sorted(existing_projects | unknown_projects)
+    projects_ids = dict((project, number) for number, project in enumerate(projects))
+
+    projects_list = []
+    dependencies_list = []
+    for project in projects:
+        is_exists = project in existing_projects
+        output_types = project.get_output_types() if is_exists else None
+        projects_list.append(dict(id=projects_ids[project],
+                                  path=project.get_project_filepath(),
+                                  exists=is_exists,
+                                  output_types=sorted(output_types) if output_types else []))
+
+        if not is_exists:
+            continue
+
+        dependencies_list.extend(
+            [projects_ids[project], projects_ids[dependency_project]]
+            for dependency_project in sorted(
+                projects_settings.get_printed_dependencies(project)))
+
+    return dict(version=_global_graph_format_version,
+                root=projects_settings.get_graph_root(),
+                projects=projects_list,
+                dependencies=dependencies_list)
+
+
+def export_graph_json(projects_settings, existing_projects, unknown_projects, json_filepath):
+    graph_dict = get_graph_dict(projects_settings, existing_projects, unknown_projects)
+
+    json_directory = os.path.dirname(json_filepath)
+    if json_directory:
+        os.makedirs(json_directory, exist_ok=True)
+
+    with open(json_filepath, 'wt', encoding='utf-8') as json_file:
+        json.dump(graph_dict, json_file)
+
+    logging.info('Graph with %d projects and %d dependencies exported to [%s]',
+                 len(graph_dict['projects']), len(graph_dict['dependencies']), json_filepath)
@@ -0,0 +1,77 @@
+def get_strongly_connected_components(nodes, get_successors):
+    '''Returns a list of strongly connected components (lists of nodes).
+
+       Iterative Tarjan's algorithm, so it works for any depth of the graph.
+       A component is returned after all components reachable from it,
+       i.e. for the dependencies graph the components of dependencies come first.'''
+    indexes = {}
+    low_links = {}
+    on_stack = set()
+    stack = []
+    components = []
+    index = 0
+
+    for start_node in nodes:
+        if start_node in indexes:
+            continue
+
+        indexes[start_node] = low_links[start_node] = index
+        index += 1
+        stack.append(start_node)
+        on_stack.add(start_node)
+        # (node, iterator over its successors)
+        work_stack = [(start_node, iter(get_successors(start_node)))]
+
+        while work_stack:
+            node, successors = work_stack[-1]
+
+            for successor in successors:
+                if successor not in indexes:
+                    indexes[successor] = low_links[successor] = index
+                    index += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work_stack.append((successor, iter(get_successors(successor))))
+                    break
+                if successor in on_stack:
+                    low_links[node] = min(low_links[node], indexes[successor])
+            else:
+                # all successors are processed
+                work_stack.pop()
+                if work_stack:
+                    parent_node = work_stack[-1][0]
+                    low_links[parent_node] = min(low_links[parent_node], low_links[node])
+
+                if low_links[node] == indexes[node]:
+                    component = []
+                    while True:
+                        component_node = stack.pop()
+                        on_stack.discard(component_node)
+                        component.append(component_node)
+                        if component_node == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def condense_graph(nodes, get_dependencies):
+    '''Returns (components, {node: component number}, get_successors) of the nodes.
+
+       get_dependencies(node) returns dependencies of the node to account,
+       get_successors(node) returns only the ones among the nodes. Components
+       are ordered as in get_strongly_connected_components: dependencies first.'''
+    nodes_set = set(nodes)
+
+    def get_successors(node):
+        return [dependency for dependency in get_dependencies(node)
+                if dependency in nodes_set]
+
+    components = get_strongly_connected_components(sorted(nodes_set), get_successors)
+
+    components_ids = {}
+    for number, component in enumerate(components):
+        for node in component:
+            components_ids[node] = number
+
+    return components, components_ids, get_successors
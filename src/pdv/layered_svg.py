@@ -0,0 +1,458 @@
+import os
+import logging
+import contextlib
+from xml.sax.saxutils import escape, quoteattr
+
+from pdv.graph import condense_graph
+
+
+# the crossing reduction stops earlier when a sweep changes nothing
+_global_max_ordering_sweeps = 8
+
+_global_font_size = 14
+_global_char_width = 8
+_global_line_height = 18
+_global_node_padding = 10
+_global_nodes_gap = 14
+_global_cluster_label_height = 22
+_global_layers_gap = 140
+_global_margin = 20
+
+# graphviz colors missing in svg
+_global_svg_colors = {
+    'green3': '#00cd00',
+    }
+
+
+def _get_svg_color(color):
+    return _global_svg_colors.get(color, color)
+
+
+def _get_dasharray(style):
+    if 'dashed' in style:
+        return '6,4'
+    if 'dotted' in style:
+        return '2,4'
+    return None
+
+
+def _get_style(attributes):
+    return set(part.strip() for part in attributes.get('style', '').split(','))
+
+
+class _LayeredGraphView:
+    '''Part of the graphviz.Digraph interface used by pdv.printer.
+       Nodes created by the view belong to its clusters'''
+    def __init__(self, graph, clusters):
+        self._graph = graph
+        self._clusters = clusters
+
+    def node(self, name, label=None, _attributes=None, **attrs):
+        node_attributes = self._graph._nodes.get(name)
+        if node_attributes is None:
+            node_attributes = self._graph._nodes[name] = {}
+            self._graph._nodes_clusters[name] = self._clusters
+
+        if label is not None:
+            node_attributes['label'] = label
+        if _attributes:
+            node_attributes.update(_attributes)
+        node_attributes.update(attrs)
+
+    def edge(self, tail_name, head_name, label=None, _attributes=None, **attrs):
+        edge_attributes = dict(_attributes) if _attributes else {}
+        edge_attributes.update(attrs)
+        if label is not None:
+            edge_attributes['label'] = label
+
+        self._graph._edges.append((tail_name, head_name, edge_attributes))
+
+    def attr(self, kw=None, _attributes=None, **attrs):
+        if _attributes:
+            attrs.update(_attributes)
+
+        if kw == 'node':
+            self._graph.node_attributes.update(attrs)
+        elif kw == 'edge':
+            self._graph.edge_attributes.update(attrs)
+        elif self._clusters:
+            self._graph._clusters_attributes[self._clusters[-1]].update(attrs)
+        else:
+            self._graph.graph_attributes.update(attrs)
+
+    @contextlib.contextmanager
+    def subgraph(self, name=None):
+        self._graph._clusters_attributes.setdefault(name, {})
+        yield _LayeredGraphView(self._graph, self._clusters + (name,))
+
+
+class LayeredDigraph(_LayeredGraphView):
+    '''Digraph which is laid out and written to svg without graphviz.
+
+       Nodes are ranked by the longest path to the projects without dependencies
+       (projects of a cycle share the rank), so every dependency goes from left
+       to right. Order of the nodes of every rank is improved by the barycenter
+       heuristic in a bounded number of sweeps. Nodes of the same subgraph
+       (directory) are kept together in every rank, subgraphs with "cluster"
+       names are drawn as frames around their nodes'''
+    def __init__(self, name=None, comment=None, filename=None, directory='',
+                 max_sweeps=_global_max_ordering_sweeps):
+        super().__init__(self, ())
+        self.name = name
+        self.comment = comment
+        self.filename = filename
+        self.directory = directory
+        self.format = 'svg'
+        self.max_sweeps = max_sweeps
+
+        self.graph_attributes = {}
+        self.node_attributes = {}
+        self.edge_attributes = {}
+        self._nodes = {}
+        self._nodes_clusters = {}
+        self._clusters_attributes = {}
+        self._edges = []
+
+    def _get_ranks(self, successors):
+        '''Returns the rank of every node, rank 0 is at the left'''
+        nodes_count = len(successors)
+        components, components_ids, _ = condense_graph(range(nodes_count),
+                                                       successors.__getitem__)
+
+        # components of the dependencies come first, so their heights are known
+        heights = [0] * nodes_count
+        for number, component in enumerate(components):
+            height = 0
+            for node_id in component:
+                for successor_id in successors[node_id]:
+                    if components_ids[successor_id] != number:
+                        height = max(height, heights[successor_id] + 1)
+            for node_id in component:
+                heights[node_id] = height
+
+        max_height = max(heights, default=0)
+        return [max_height - height for height in heights]
+
+    def _order_layers(self, layers, ranks, predecessors, successors, clusters):
+        '''Reorders nodes of the layers in place by the barycenter heuristic'''
+        positions = [0.0] * len(ranks)
+        for layer in layers:
+            for index, node_id in enumerate(layer):
+                positions[node_id] = index / len(layer)
+
+        sweeps = 0
+        unchanged_sweeps = 0
+        while sweeps < self.max_sweeps and unchanged_sweeps < 2:
+            # left to right by the dependents, then right to left by the dependencies
+            if sweeps % 2 == 0:
+                layers_order, neighbours = range(len(layers)), predecessors
+            else:
+                layers_order, neighbours = range(len(layers) - 1, -1, -1), successors
+            sweeps += 1
+
+            is_changed = False
+            for layer_number in layers_order:
+                layer = layers[layer_number]
+
+                barycenters = {}
+                clusters_sums = {}
+                for node_id in layer:
+                    neighbours_positions = [positions[neighbour_id]
+                                            for neighbour_id in neighbours[node_id]
+                                            if ranks[neighbour_id] != layer_number]
+                    barycenter = sum(neighbours_positions) / len(neighbours_positions) \
+                        if neighbours_positions else positions[node_id]
+                    barycenters[node_id] = barycenter
+                    for cluster in clusters[node_id]:
+                        cluster_sum = clusters_sums.get(cluster)
+                        if cluster_sum is None:
+                            clusters_sums[cluster] = [barycenter, 1]
+                        else:
+                            cluster_sum[0] += barycenter
+                            cluster_sum[1] += 1
+
+                # clusters are ordered by their barycenters first, so they are not split
+                def get_order_key(node_id):
+                    return tuple(clusters_sums[cluster][0] / clusters_sums[cluster][1]
+                                 for cluster in clusters[node_id]) + (barycenters[node_id],)
+
+                ordered_layer = sorted(layer, key=get_order_key)
+                if ordered_layer != layer:
+                    is_changed = True
+                    layer[:] = ordered_layer
+                    for index, node_id in enumerate(layer):
+                        positions[node_id] = index / len(layer)
+
+            unchanged_sweeps = 0 if is_changed else unchanged_sweeps + 1
+
+        return sweeps
+
+    def _layout(self):
+        '''Returns (names, attributes, clusters, geometry (x, y, width, height),
+           ranks, edges as (tail id, head id, attributes), layers, layers x and widths)'''
+        # nodes mentioned only by the edges are created as in graphviz
+        for tail_name, head_name, _ in self._edges:
+            for name in (tail_name, head_name):
+                if name not in self._nodes:
+                    self._nodes[name] = {}
+                    self._nodes_clusters[name] = ()
+
+        names = list(self._nodes)
+        ids = dict((name, number) for number, name in enumerate(names))
+        attributes = [dict(self.node_attributes, **self._nodes[name]) for name in names]
+        clusters = [self._nodes_clusters[name] for name in names]
+
+        predecessors = [[] for _ in names]
+        successors = [[] for _ in names]
+        edges = []
+        for tail_name, head_name, edge_attributes in self._edges:
+            tail_id = ids[tail_name]
+            head_id = ids[head_name]
+            edges.append((tail_id, head_id, dict(self.edge_attributes, **edge_attributes)))
+            if tail_id != head_id:
+                successors[tail_id].append(head_id)
+                predecessors[head_id].append(tail_id)
+
+        ranks = self._get_ranks(successors)
+        # nodes are declared in the order of the directories tree
+        layers = [[] for _ in range(max(ranks, default=-1) + 1)]
+        for node_id, rank in enumerate(ranks):
+            layers[rank].append(node_id)
+
+        sweeps = self._order_layers(layers, ranks, predecessors, successors, clusters)
+
+        geometry = [None] * len(names)
+        for node_id, node_attributes in enumerate(attributes):
+            lines = node_attributes.get('label', names[node_id]).split('\n')
+            width = max(len(line) for line in lines) * _global_char_width + \
+                2 * _global_node_padding
+            height = len(lines) * _global_line_height + _global_node_padding
+            geometry[node_id] = [0, 0, width, height]
+
+        top = _global_margin
+        if 'label' in self.graph_attributes:
+            top += _global_font_size * 2
+
+        layers_x = []
+        layers_widths = []
+        layers_heights = []
+        x = _global_margin
+        for layer in layers:
+            layer_width = max(geometry[node_id][2] for node_id in layer)
+            y = 0
+            previous_clusters = None
+            for node_id in layer:
+                if clusters[node_id] != previous_clusters:
+                    previous_clusters = clusters[node_id]
+                    if clusters[node_id]:
+                        y += _global_cluster_label_height
+                node_geometry = geometry[node_id]
+                node_geometry[0] = x + (layer_width - node_geometry[2]) / 2
+                node_geometry[1] = y
+                y += node_geometry[3] + _global_nodes_gap
+
+            layers_x.append(x)
+            layers_widths.append(layer_width)
+            layers_heights.append(y)
+            x += layer_width + _global_layers_gap
+
+        # layers are centered vertically
+        max_height = max(layers_heights, default=0)
+        for layer, layer_height in zip(layers, layers_heights):
+            shift = top + (max_height - layer_height) / 2
+            for node_id in layer:
+                geometry[node_id][1] += shift
+
+        logging.info('Layered layout: %d nodes, %d edges, %d layers, %d ordering sweeps',
+                     len(names), len(edges), len(layers), sweeps)
+
+        width = x - _global_layers_gap + _global_margin if layers else 2 * _global_margin
+        height = top + max_height + _global_margin
+
+        return (names, attributes, clusters, geometry, ranks, edges, layers,
+                layers_x, layers_widths, width, height)
+
+    def _write_clusters(self, svg_lines, layers, clusters, geometry, layers_x, layers_widths):
+        for layer, layer_x, layer_width in zip(layers, layers_x, layers_widths):
+            # frame of the consecutive nodes of the same innermost cluster
+            runs = []
+            for node_id in layer:
+                cluster = clusters[node_id][-1] if clusters[node_id] else None
+                if runs and runs[-1][0] == cluster:
+                    runs[-1][2] = node_id
+                else:
+                    runs.append([cluster, node_id, node_id])
+
+            for cluster, first_id, last_id in runs:
+                if cluster is None or not cluster.startswith('cluster'):
+                    continue
+                cluster_attributes = self._clusters_attributes.get(cluster, {})
+                top = geometry[first_id][1] - _global_cluster_label_height
+                bottom = geometry[last_id][1] + geometry[last_id][3] + _global_nodes_gap / 2
+                svg_lines.append(
+                    '<g class="cluster"><title>{}</title>'
+                    '<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" fill="none" '
+                    'stroke="grey" stroke-dasharray="2,4"/>'
+                    '<text x="{:.1f}" y="{:.1f}" font-size="{}" fill="darkgreen">{}</text>'
+                    '</g>'.format(escape(cluster),
+                                  layer_x - _global_nodes_gap / 2, top,
+                                  layer_width + _global_nodes_gap, bottom - top,
+                                  layer_x - _global_nodes_gap / 2 + 4,
+                                  top + _global_cluster_label_height - 8,
+                                  _global_font_size - 2,
+                                  escape(cluster_attributes.get('label', ''))))
+
+    @staticmethod
+    def _get_edge_path(tail_geometry, head_geometry, tail_rank, head_rank):
+        '''Returns the cubic bezier points of the edge'''
+        tail_x, tail_y, tail_width, tail_height = tail_geometry
+        head_x, head_y, head_width, head_height = head_geometry
+        tail_middle = tail_y + tail_height / 2
+        head_middle = head_y + head_height / 2
+
+        if tail_rank < head_rank:
+            start_x = tail_x + tail_width
+            end_x = head_x
+            control_x = (start_x + end_x) / 2
+            return ((start_x, tail_middle), (control_x, tail_middle),
+                    (control_x, head_middle), (end_x, head_middle))
+
+        if tail_geometry is head_geometry:
+            # the node depends on itself
+            start_x = tail_x + tail_width
+            return ((start_x, tail_y + tail_height / 4),
+                    (start_x + 30, tail_y - 10),
+                    (start_x + 30, tail_y + tail_height + 10),
+                    (start_x, tail_y + tail_height * 3 / 4))
+
+        # dependencies inside a cycle go around the right side of the layer
+        start_x = tail_x + tail_width
+        end_x = head_x + head_width
+        bend = 40 + abs(head_middle - tail_middle) / 10
+        return ((start_x, tail_middle), (start_x + bend, tail_middle),
+                (end_x + bend, head_middle), (end_x, head_middle))
+
+    def _write_edges(self, svg_lines, edges, geometry, ranks):
+        markers = {}
+        edges_lines = []
+        for tail_id, head_id, edge_attributes in edges:
+            color = _get_svg_color(edge_attributes.get('color', 'black'))
+            marker = markers.setdefault(color, 'arrow' + str(len(markers)))
+
+            points = self._get_edge_path(geometry[tail_id], geometry[head_id],
+                                         ranks[tail_id], ranks[head_id])
+            path = 'M{:.1f},{:.1f} C{:.1f},{:.1f} {:.1f},{:.1f} {:.1f},{:.1f}'.format(
+                *[coordinate for point in points for coordinate in point])
+
+            path_attributes = 'fill="none" stroke={} stroke-width="{}" marker-end="url(#{})"'.format(
+                quoteattr(color), escape(edge_attributes.get('penwidth', '1')), marker)
+            dasharray = _get_dasharray(_get_style(edge_attributes))
+            if dasharray:
+                path_attributes += ' stroke-dasharray="{}"'.format(dasharray)
+
+            edge_lines = ['<g class="edge">']
+            if 'tooltip' in edge_attributes:
+                edge_lines.append('<title>{}</title>'.format(escape(edge_attributes['tooltip'])))
+            edge_lines.append('<path d="{}" {}/>'.format(path, path_attributes))
+            if 'label' in edge_attributes:
+                # middle of the bezier curve
+                label_x = (points[0][0] + 3 * points[1][0] + 3 * points[2][0] + points[3][0]) / 8
+                label_y = (points[0][1] + 3 * points[1][1] + 3 * points[2][1] + points[3][1]) / 8
+                edge_lines.append(
+                    '<text x="{:.1f}" y="{:.1f}" text-anchor="middle" font-size="{}">{}</text>'
+                    .format(label_x, label_y - 4, _global_font_size - 2,
+                            escape(edge_attributes['label'])))
+            edge_lines.append('</g>')
+            edges_lines.append(''.join(edge_lines))
+
+        svg_lines.append('<defs>')
+        for color, marker in markers.items():
+            svg_lines.append(
+                '<marker id="{}" viewBox="0 0 10 10" refX="10" refY="5" '
+                'markerUnits="userSpaceOnUse" markerWidth="10" markerHeight="10" '
+                'orient="auto"><path d="M0,0 L10,5 L0,10 z" fill={}/></marker>'.format(
+                    marker, quoteattr(color)))
+        svg_lines.append('</defs>')
+        svg_lines.extend(edges_lines)
+
+    @staticmethod
+    def _write_nodes(svg_lines, names, attributes, geometry):
+        for node_id, node_attributes in enumerate(attributes):
+            x, y, width, height = geometry[node_id]
+            style = _get_style(node_attributes)
+            color = _get_svg_color(node_attributes.get('color', 'black'))
+            fill = _get_svg_color(node_attributes.get('fillcolor', color)) \
+                if 'filled' in style else 'white'
+
+            rect_attributes = 'fill={} stroke={} stroke-width="{}"'.format(
+                quoteattr(fill), quoteattr(color), escape(node_attributes.get('penwidth', '1')))
+            if 'rounded' in style:
+                rect_attributes += ' rx="6"'
+            dasharray = _get_dasharray(style)
+            if dasharray:
+                rect_attributes += ' stroke-dasharray="{}"'.format(dasharray)
+
+            node_lines = ['<g class="node">']
+            if 'href' in node_attributes:
+                node_lines.append('<a xlink:href={}>'.format(quoteattr(node_attributes['href'])))
+            node_lines.append('<title>{}</title>'.format(
+                escape(node_attributes.get('tooltip', names[node_id]))))
+            node_lines.append(
+                '<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" {}/>'.format(
+                    x, y, width, height, rect_attributes))
+
+            lines = node_attributes.get('label', names[node_id]).split('\n')
+            for number, line in enumerate(lines):
+                node_lines.append(
+                    '<text x="{:.1f}" y="{:.1f}" text-anchor="middle">{}</text>'.format(
+                        x + width / 2,
+                        y + _global_node_padding / 2 + (number + 0.75) * _global_line_height,
+                        escape(line)))
+
+            if 'href' in node_attributes:
+                node_lines.append('</a>')
+            node_lines.append('</g>')
+            svg_lines.append(''.join(node_lines))
+
+    def render(self):
+        '''Writes the svg image to the directory/filename.svg, returns its path'''
+        (names, attributes, clusters, geometry, ranks, edges, layers,
+         layers_x, layers_widths, width, height) = self._layout()
+
+        svg_lines = ['<?xml version="1.0" encoding="UTF-8" standalone="no"?>']
+        if self.comment:
+            svg_lines.append('<!-- {} -->'.format(self.comment.replace('--', '- -')))
+        svg_lines.append(
+            '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            'width="{0:.0f}pt" height="{1:.0f}pt" viewBox="0 0 {0:.0f} {1:.0f}" '
+            'font-family="Times,serif" font-size="{2}">'.format(width, height, _global_font_size))
+        svg_lines.append('<rect width="100%" height="100%" fill="white"/>')
+
+        if 'label' in self.graph_attributes:
+            svg_lines.append('<text x="{:.1f}" y="{:.1f}" text-anchor="middle" '
+                             'font-size="{}" fill={}>{}</text>'.format(
+                                 width / 2, _global_margin + _global_font_size,
+                                 self.graph_attributes.get('fontsize', _global_font_size),
+                                 quoteattr(self.graph_attributes.get('fontcolor', 'black')),
+                                 escape(self.graph_attributes['label'])))
+
+        self._write_clusters(svg_lines, layers, clusters, geometry, layers_x, layers_widths)
+        self._write_edges(svg_lines, edges, geometry, ranks)
+        self._write_nodes(svg_lines, names, attributes, geometry)
+        svg_lines.append('</svg>')
+
+        svg_filepath = os.path.join(self.directory or '', self.filename) + '.' + self.format
+        svg_directory = os.path.dirname(svg_filepath)
+        if svg_directory:
+            os.makedirs(svg_directory, exist_ok=True)
+
+        with open(svg_filepath, 'wt', encoding='utf-8') as svg_file:
+            svg_file.write('\n'.join(svg_lines))
+            svg_file.write('\n')
+
+        logging.info('Image saved to [%s]', svg_filepath)
+
+        return svg_filepath
+
+    # there is no source to save without graphviz, the image is the only output
+    save = render
@@ -0,0 +1,430 @@
+import os
+import enum
+import mmap
+import logging
+
+from pdv.context import ProjectsContext
+
+
+def get_attribute_values(dom, tag, attribute, masks):
+    '''Returns a list of found values of attributes under the given tag
+       that matches any of masks'''
+
+    if dom is None:
+        return None
+
+    values = []
+
+    tag_nodes = dom.getElementsByTagName(tag)
+    for tag_node in tag_nodes:
+        if tag_node.hasAttribute(attribute):
+            # TODO: values may be found with a condition
+            # Example: <Import Project="$(UserRootDir)\Microsoft.Cpp.$(Platform).user.props" Condition="exists('$(UserRootDir)\Microsoft.Cpp.$(Platform).user.props')" Label="LocalAppDataPlatform" />
+            # so we should take into account this case
+            value = tag_node.getAttribute(attribute)
+            if not masks:
+                # allow any dependency
+                values.append(value)
+            else:
+                # search for matches under mask
+                for mask in masks:
+                    if value.lower().endswith(mask):
+                        values.append(value)
+                        break
+
+    return values
+
+class MSBuildItems(enum.Enum):
+    ITEM_PROJECT_REF = 'ProjectReference'
+    ITEM_PROJECT_REF2 = 'ProjectReference2'
+    ITEM_IMPORT = 'Import'
+
+    def get_attribute(self):
+        return {MSBuildItems.ITEM_PROJECT_REF: 'Include',
+                MSBuildItems.ITEM_PROJECT_REF2: 'Include',
+                MSBuildItems.ITEM_IMPORT: 'Project'
+               }[self]
+
+    def get_dependencies(self, project_dom, masks):
+        '''Returns a list of found values of the corresponding attribute under self.value tag'''
+        return get_attribute_values(project_dom, self.value, self.get_attribute(), masks)
+
+
+class MSBuildItemDependencyInfo():
+    def __init__(self, item_name, masks):
+        self.item = MSBuildItems(item_name)
+        self.dependencies_masks =\
+            [mask.lower() for mask in masks] if masks else None
+
+
+# tags under which MSBuildXmlProject.get_output_types looks for the project output type
+_global_output_type_tags = ('ConfigurationType', 'OutputType')
+
+# NuGet packages of the project: PackageReference items
+# or the packages.config file in the project directory
+_global_package_reference_tag = 'PackageReference'
+_global_packages_config_filename = 'packages.config'
+
+
+def get_packages_config_references(packages_config_filepath):
+    '''Returns (package name, version) pairs from the packages.config file'''
+    import xml.dom.minidom as minidom
+
+    try:
+        packages_config_dom = minidom.parse(packages_config_filepath)
+    except:
+        logging.error('Failed to parse packages config [%s].', packages_config_filepath)
+        return []
+
+    return [(package_node.getAttribute('id'), package_node.getAttribute('version'))
+            for package_node in packages_config_dom.getElementsByTagName('package')
+            if package_node.getAttribute('id')]
+
+
+class ProjectFilePrescanner:
+    '''Searches the raw bytes of a project file for the opening tags of interest.
+       A file without any of these tags can skip the xml parsing completely.'''
+    _boms = ((b'\xef\xbb\xbf', 'utf-8'),
+             (b'\xff\xfe', 'utf-16-le'),
+             (b'\xfe\xff', 'utf-16-be'),
+             # utf-16 without BOM: the file must start with '<'
+             (b'<\x00', 'utf-16-le'),
+             (b'\x00<', 'utf-16-be'))
+
+    def __init__(self, tags):
+        self.tags = sorted(set(tags))
+        self._patterns = {}
+        self.scanned_files = 0
+        self.skipped_files = 0
+
+    @staticmethod
+    def get_tags(dependenies_info, collect_packages=False):
+        '''Returns tags for the active dependencies items and the project output types'''
+        tags = [info.item.value for info in dependenies_info]
+        tags.extend(_global_output_type_tags)
+        if collect_packages:
+            tags.append(_global_package_reference_tag)
+        return tags
+
+    def _get_patterns(self, encoding):
+        if encoding not in self._patterns:
+            self._patterns[encoding] = [('<' + tag).encode(encoding) for tag in self.tags]
+        return self._patterns[encoding]
+
+    @staticmethod
+    def _guess_encoding(file_bytes):
+        for bom, encoding in ProjectFilePrescanner._boms:
+            if file_bytes[:len(bom)] == bom:
+                return encoding
+        # any ascii compatible encoding (utf-8, cp1252, ...)
+        return 'utf-8'
+
+    def has_tags(self, file_path):
+        '''Returns False only when the file definitely contains none of the tags'''
+        try:
+            with open(file_path, 'rb') as project_file:
+                if os.fstat(project_file.fileno()).st_size == 0:
+                    found = False
+                else:
+                    with mmap.mmap(project_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ) as file_bytes:
+                        encoding = self._guess_encoding(file_bytes)
+                        found = any(file_bytes.find(pattern) != -1
+                                    for pattern in self._get_patterns(encoding))
+        except (OSError, ValueError):
+            # let the xml parser report the problem
+            return True
+
+        self.scanned_files += 1
+        if not found:
+            self.skipped_files += 1
+            logging.debug('Pre-scan: no tags of interest in [%s]. Parsing is skipped.', file_path)
+
+        return found
+
+    def log_statistics(self):
+        hit_rate = 100.0 * self.skipped_files / self.scanned_files if self.scanned_files else 0.0
+        logging.info('Pre-scan: %d files scanned, %d files skipped parsing (%0.1f%%)',
+                     self.scanned_files, self.skipped_files, hit_rate)
+
+
+def is_standard_project(project_filepath):
+    # TODO: extend this list and/or use config for a projects to be ignored
+    standard_projects = ['Microsoft.Cpp.props',
+                         'Microsoft.Cpp.Default.props',
+                         'Microsoft.Cpp.$(Platform).user.props']
+    for proj in standard_projects:
+        if project_filepath.endswith(proj):
+            return True
+
+    return False
+
+class MSBuildXmlProject:
+    '''Instance of this class is any MSBuld project like "*proj" or "*.props" or "*.targets" file'''
+    def __init__(self, project_file_path, dependenies_info, context=None):
+        self.file_path = project_file_path
+        self.dependenies_info = dependenies_info
+        self.context = context if context else ProjectsContext()
+        self.proj_dependencies = set()
+        self._dom = None
+        self._has_tags = None
+        self._number = None
+
+    def __str__(self):
+        return 'Project [{}]'.format(self.file_path)
+
+    def __hash__(self):
+        return hash(self.file_path.lower())
+
+    def __eq__(self, other):
+        return self.file_path.lower() == other.file_path.lower()
+
+    def __lt__(self, other):
+        return self.file_path.lower() < other.file_path.lower()
+
+    def _add_project_dependency(self, project):
+        if project in self.proj_dependencies:
+            logging.info('Project [%s] already present as dependency for [%s]',
+                         project.get_project_filepath(),
+                         self.get_project_filepath())
+            return
+
+        self.proj_dependencies.add(project)
+
+    def _has_tags_of_interest(self):
+        if self.context.prescanner is None:
+            return True
+
+        if self._has_tags is None:
+            self._has_tags = self.context.prescanner.has_tags(self.file_path)
+
+        return self._has_tags
+
+    def _get_project_dom(self):
+        if self._dom is None:
+            if not self.is_project_exists():
+                logging.warning("Failed to parse xml. File [%s] not found.", self.file_path)
+                return None
+
+            # TODO: consider using xml.etree.ElementTree
+            import xml.dom.minidom as minidom
+
+            try:
+                self._dom = minidom.parse(self.file_path)
+            except:
+                logging.error('Failed to parse project [%s].', self.file_path)
+                return None
+
+        return self._dom
+
+    def is_project_exists(self):
+        return os.path.isfile(self.file_path)
+
+    def _get_project_abs_path(self, project_path):
+        if os.path.isabs(project_path):
+            return os.path.normpath(project_path)
+
+        # Here project_path may be relative to the current project dir
+        this_project_dir = os.path.dirname(self.file_path)
+        project_path_abs = os.path.join(this_project_dir, project_path)
+        if os.path.isfile(project_path_abs):
+            return os.path.normpath(project_path_abs)
+
+        # Here project_path may contain visual studio variables in the path.
+        # For example $(SolutionDir), $(VCTargetsPath) etc.
+        resolved_path = self.context.try_resolve_variables(project_path)
+
+        if os.path.isfile(resolved_path):
+            return os.path.abspath(resolved_path)
+
+        # some variables may not have been resolved
+        return project_path
+
+    def get_project_filepath(self):
+        return self.file_path
+
+    def get_project_filename(self):
+        return os.path.basename(self.file_path)
+
+    def get_project_directory(self):
+        return os.path.dirname(self.file_path)
+
+    def get_project_dependencies(self):
+        return self.proj_dependencies
+
+    def set_number(self, number):
+        self._number = number
+
+    def get_number(self):
+        return self._number
+
+    @staticmethod
+    def _get_dom_node_value(node):
+        value = None
+        if node.firstChild.nodeType == node.TEXT_NODE:
+            value = node.firstChild.nodeValue
+
+        return value
+
+    @staticmethod
+    def _get_dom_child_node_value_by_tag(parent_node, tag):
+        for node in parent_node.childNodes:
+            if (node.nodeType == node.ELEMENT_NODE and
+                    node.tagName == tag):
+                return node.firstChild.nodeValue if node.firstChild else None
+        return None
+
+    @staticmethod
+    def _get_dom_nodes_values_by_tag(dom, tag):
+        result = []
+
+        nodes = dom.getElementsByTagName(tag)
+        for node in nodes:
+            value = MSBuildXmlProject._get_dom_node_value(node)
+            if value:
+                result.append(value)
+
+        return result
+
+    def get_output_types(self):
+        if not self._has_tags_of_interest():
+            return None
+
+        this_project_dom = self._get_project_dom()
+
+        if this_project_dom is None:
+            return None
+
+        output_types = set()
+
+        # For *.vcxproj output type stored under tag 'ConfigurationType'
+        # For *.csproj output type stored under tag 'OutputType'
+        for tag in _global_output_type_tags:
+            values = MSBuildXmlProject._get_dom_nodes_values_by_tag(this_project_dom, tag)
+            if values:
+                output_types.update(values)
+
+        return output_types if output_types else None
+
+    def get_package_references(self):
+        '''Returns (package name, version) pairs of the PackageReference items
+           and of the packages.config file (only for *proj files, not for the imported
+           *.props and *.targets). Version is empty when it is defined elsewhere
+           (for example, by the central package management)'''
+        references = []
+
+        this_project_dom = self._get_project_dom() if self._has_tags_of_interest() else None
+        if this_project_dom is not None:
+            for reference_node in this_project_dom.getElementsByTagName(
+                    _global_package_reference_tag):
+                name = reference_node.getAttribute('Include')
+                if not name:
+                    # Update or Remove of an item defined elsewhere
+                    continue
+
+                version = reference_node.getAttribute('Version')
+                if not version:
+                    version = MSBuildXmlProject._get_dom_child_node_value_by_tag(
+                        reference_node, 'Version') or ''
+                references.append((name, version.strip()))
+
+        if not self.get_project_filename().lower().endswith('proj'):
+            return references
+
+        packages_config_filepath = os.path.join(self.get_project_directory(),
+                                                _global_packages_config_filename)
+        if os.path.isfile(packages_config_filepath):
+            references.extend(get_packages_config_references(packages_config_filepath))
+
+        return references
+
+    def _collect_dependencies_attribute_by_info(self, all_projects, new_detected_projects, info):
+        this_project_dom = self._get_project_dom()
+
+        if this_project_dom is None:
+            return
+
+        dependencies_list = info.item.get_dependencies(this_project_dom, info.dependencies_masks)
+        for dependency in dependencies_list:
+            dependency_abs_path = self._get_project_abs_path(dependency)
+            dependency_abs_path_lower = dependency_abs_path.lower()
+            if dependency_abs_path_lower not in all_projects:
+                current_project_dependency =\
+                    MSBuildXmlProject(dependency_abs_path, self.dependenies_info,
+                                      self.context)
+                new_detected_projects.add(current_project_dependency)
+            else:
+                current_project_dependency = all_projects[dependency_abs_path_lower]
+
+            self._add_project_dependency(current_project_dependency)
+
+    def collect_dependencies(self, all_projects, new_detected_projects):
+        if not self.is_project_exists():
+            return
+
+        if not self._has_tags_of_interest():
+            # nothing to collect, so do not parse the file at all
+            return
+
+        for info in self.dependenies_info:
+            self._collect_dependencies_attribute_by_info(all_projects, new_detected_projects, info)
+
+
+class DependenciesCollector:
+    '''This class is intended to collect dependencies of the MSBuildXml projects'''
+    def __init__(self, dependenies_info, use_prescan=True, variables=None,
+                 collect_packages=False):
+        self.dependenies_info = dependenies_info
+        self.prescanner = None
+        if use_prescan:
+            self.prescanner = ProjectFilePrescanner(
+                ProjectFilePrescanner.get_tags(dependenies_info, collect_packages))
+        self.context = ProjectsContext(variables, self.prescanner)
+
+    def collect_dependencies(self, project_file_paths_list):
+        '''project_file_paths_list may be any iterable, for example a generator
+           of the files being discovered: every project is processed as soon as
+           its path is taken'''
+        all_projects = {}
+        processed_projects = set()
+        new_detected_projects = set()
+        projects_to_process = set()
+
+        for path in project_file_paths_list:
+            if path.lower() in all_projects:
+                # already found as a dependency or listed twice
+                continue
+
+            project = MSBuildXmlProject(path, self.dependenies_info, self.context)
+            all_projects[path.lower()] = project
+            projects_to_process.add(project)
+
+            while projects_to_process:
+                project = projects_to_process.pop()
+                # search for project dependencies
+                new_detected_projects.clear()
+                project.collect_dependencies(all_projects,
+                                             new_detected_projects)
+                processed_projects.add(project)
+
+                # populate all_projects with a new found projects
+                all_projects.update(
+                    (it.get_project_filepath().lower(), it) for it in new_detected_projects)
+
+                # save items to find their dependencies later in the next iterations
+                projects_to_process.update(it for it in new_detected_projects)
+
+        # enumerate projects
+        project_number = 0
+        for project in processed_projects:
+            project.set_number(project_number)
+            project_number = project_number + 1
+
+        existing_projects = set(item for item in processed_projects
+                                if item.is_project_exists())
+        unknown_projects = processed_projects - existing_projects
+
+        if self.prescanner:
+            self.prescanner.log_statistics()
+
+        return existing_projects, unknown_projects
@@ -0,0 +1,126 @@
+import os
+import csv
+import array
+import logging
+
+
+class PackageIndex:
+    '''NuGet packages referenced by the projects.
+
+       Package names (case insensitive) and versions are interned into numbers,
+       so every package is stored once however many projects reference it.
+       A reference is a pair of numbers (project number, version number)
+       kept in the arrays of the package'''
+    def __init__(self):
+        self.projects = []
+        self.names = []
+        self.versions = []
+        self._names_ids = {}
+        self._versions_ids = {}
+        # package id -> project numbers and version ids of its references
+        self._references_projects = []
+        self._references_versions = []
+
+    def _get_package_id(self, name):
+        package_id = self._names_ids.get(name.lower())
+        if package_id is None:
+            package_id = self._names_ids[name.lower()] = len(self.names)
+            self.names.append(name)
+            self._references_projects.append(array.array('l'))
+            self._references_versions.append(array.array('l'))
+        return package_id
+
+    def _get_version_id(self, version):
+        version_id = self._versions_ids.get(version)
+        if version_id is None:
+            version_id = self._versions_ids[version] = len(self.versions)
+            self.versions.append(version)
+        return version_id
+
+    def add_project(self, project, references):
+        '''Adds (package name, version) references of the project'''
+        project_number = len(self.projects)
+        self.projects.append(project)
+
+        for name, version in references:
+            package_id = self._get_package_id(name)
+            self._references_projects[package_id].append(project_number)
+            self._references_versions[package_id].append(self._get_version_id(version))
+
+    def get_packages_count(self):
+        return len(self.names)
+
+    def get_references_count(self):
+        return sum(len(projects) for projects in self._references_projects)
+
+    def get_package_references(self, package_id):
+        '''Yields (project, version) pairs of the package'''
+        for project_number, version_id in zip(self._references_projects[package_id],
+                                              self._references_versions[package_id]):
+            yield self.projects[project_number], self.versions[version_id]
+
+    def get_package_versions(self, package_id):
+        '''Returns {version: number of the referencing projects}'''
+        versions = {}
+        for version_id in self._references_versions[package_id]:
+            version = self.versions[version_id]
+            versions[version] = versions.get(version, 0) + 1
+        return versions
+
+    def is_conflict(self, package_id):
+        '''Returns True when the projects reference different versions of the package.
+           Empty versions (defined elsewhere) are not accounted'''
+        versions = set(self._references_versions[package_id])
+        versions.discard(self._versions_ids.get(''))
+        return len(versions) > 1
+
+    def get_conflicts(self):
+        return [package_id for package_id in range(len(self.names))
+                if self.is_conflict(package_id)]
+
+    def export_matrix_csv(self, csv_filepath):
+        '''Saves the project x package matrix: a row per project with any packages,
+           a column per package, the cells are the referenced versions'''
+        packages_ids = sorted(range(len(self.names)), key=lambda package_id:
+                              self.names[package_id].lower())
+        columns = dict((package_id, column) for column, package_id in enumerate(packages_ids))
+
+        rows = {}
+        for package_id in packages_ids:
+            for project_number, version_id in zip(self._references_projects[package_id],
+                                                  self._references_versions[package_id]):
+                row = rows.get(project_number)
+                if row is None:
+                    row = rows[project_number] = [''] * len(packages_ids)
+                version = self.versions[version_id] or '*'
+                column = columns[package_id]
+                # the same package may be referenced twice with different versions
+                row[column] = version if not row[column] else row[column] + ';' + version
+
+        csv_directory = os.path.dirname(csv_filepath)
+        if csv_directory:
+            os.makedirs(csv_directory, exist_ok=True)
+
+        with open(csv_filepath, 'wt', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['project'] + [self.names[package_id] for package_id in packages_ids])
+            for project_number in sorted(rows, key=lambda number: self.projects[number]):
+                writer.writerow([self.projects[project_number].get_project_filepath()] +
+                                rows[project_number])
+
+        logging.info('Matrix of %d projects and %d packages saved to [%s]',
+                     len(rows), len(packages_ids), csv_filepath)
+
+
+def build_package_index(projects):
+    '''Returns PackageIndex of the package references of the projects'''
+    package_index = PackageIndex()
+    for project in sorted(projects):
+        package_index.add_project(project, project.get_package_references())
+
+    logging.info('%d packages (%d versions) referenced %d times, %d packages with '
+                 'versions conflicts', package_index.get_packages_count(),
+                 len(package_index.versions), package_index.get_references_count(),
+                 len(package_index.get_conflicts()))
+
+    return package_index
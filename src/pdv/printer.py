@@ -0,0 +1,638 @@
+import os
+import logging
+
+from pdv.directory_tree import build_directory_tree, get_collapsed_directories
+from pdv.sharding import ShardingMethods, get_directory_shards, get_min_cut_shards
+
+
+_global_unknown_node_style = dict(
+    shape='box',
+    style='dashed',
+    color='red',
+    )
+
+
+_global_unknown_edge_style = dict(
+    color='red',
+    )
+
+
+_global_unknown_aggregate_node_name = 'unknown'
+
+
+_global_packages_aggregate_node_name = 'packages'
+
+
+_global_critical_path_edge_style = dict(
+    color='black',
+    penwidth='5',
+    )
+
+
+_global_critical_path_node_style = dict(
+    penwidth='5',
+    fillcolor='lightpink',
+    )
+
+
+_global_stub_node_style = dict(
+    shape='cds',
+    style='dashed',
+    color='grey',
+    )
+
+
+_global_aggregate_node_style = dict(
+    shape='folder',
+    style='filled',
+    color='brown',
+    fillcolor='wheat',
+    )
+
+
+_global_package_node_style = dict(
+    shape='component',
+    style='filled',
+    color='darkslategray',
+    fillcolor='lightcyan',
+    )
+
+
+_global_package_edge_style = dict(
+    color='darkslategray',
+    )
+
+
+_global_package_conflict_node_style = dict(
+    color='red',
+    fillcolor='mistyrose',
+    penwidth='3',
+    )
+
+
+_global_package_conflict_edge_style = dict(
+    color='red',
+    )
+
+
+class ProjectDependencyPrinter:
+    def __init__(self, projects_settings):
+        self.projects_settings = projects_settings
+        # (project, dependency) pairs to be highlighted on the image
+        self.highlighted_dependencies = set()
+        self.highlighted_projects = set()
+        # pdv.packages.PackageIndex when the packages are collected
+        self.package_index = None
+
+    @staticmethod
+    def set_default_graph_settings(dot_graph):
+        default_node_style = dict(
+            rankdir='LR',
+            style='dotted, bold',
+            color='grey',
+            fontcolor='darkgreen',
+            fontsize='16',
+            labelloc='t'
+            )
+        # WARNING!
+        # using of "newrank='false'" parameter with any value (true or false)
+        # give us sometimes the render-error:
+        #   "Error: trouble in init_rank"
+        # It is graphviz bug. Possibly this bug will be fixed in the next version
+        # of the graphviz (after 2.38).
+
+        dot_graph.attr(**default_node_style)
+
+    @staticmethod
+    def set_default_graph_nodes_settings(dot_graph):
+        default_node_style = dict(
+            shape='box',
+            style='filled, rounded',
+            color='brown',
+            fillcolor='beige',
+            penwidth='2'
+            )
+
+        dot_graph.attr('node', **default_node_style)
+
+    @staticmethod
+    def get_project_output_type_color(project):
+        project_colors_dict = dict({
+            'DEFAULT': 'brown',
+            'MIXED': 'orangered',
+            # *.vcxproj
+            'dynamiclibrary': 'blue',
+            'driver': 'magenta',
+            'staticlibrary': 'deepskyblue',
+            'application': 'limegreen',
+            # *.csproj
+            'library' : 'cornflowerblue',
+            'module' : 'darkviolet',
+            'exe' : 'green',
+            'winexe' : 'greenyellow',
+        })
+
+        # more colors here:
+        # https://www.graphviz.org/doc/info/colors.html
+
+        color = project_colors_dict['DEFAULT']
+
+        output_types = project.get_output_types()
+        if output_types is None:
+            return color
+
+        output_types = [type.lower() for type in output_types]
+
+        if len(output_types) > 1:
+            color = project_colors_dict['MIXED']
+        else:
+            color = project_colors_dict.get(
+                output_types.pop(), project_colors_dict['DEFAULT'])
+
+        return color
+
+    @staticmethod
+    def set_default_graph_edges_settings(dot_graph):
+        default_edge_style = dict(
+            color='brown',
+            )
+
+        dot_graph.attr('edge', **default_edge_style)
+
+    @staticmethod
+    def make_subgraph_name_by_path(project_path, hide_paths):
+        prefix = 'cluster_'
+
+        if hide_paths:
+            prefix = ''
+
+        name = project_path
+        for character in (os.path.sep, ':', '.'):
+            name = name.replace(character, '_')
+
+        return prefix + name
+
+    @staticmethod
+    def print_directories_tree(directory_node, parent_dot_object, common_path, hide_paths,
+                               aggregate_nodes=None):
+        if not directory_node:
+            return
+
+        if not parent_dot_object:
+            raise Exception('Parent dot object is not specified')
+
+        current_path = directory_node.get_directory_name()
+
+        if not common_path:
+            # directory_node should be the root
+            common_path = current_path
+
+        # print full path only for root subgraph
+        # add last separator for all
+        if common_path == current_path:
+            label_text = os.path.join(current_path, '')
+        else:
+            label_text = os.path.join(current_path, '')[len(common_path) + 1:]
+        label_text = label_text.replace('\\', '/')
+
+        if aggregate_nodes and directory_node in aggregate_nodes:
+            # the whole directory is printed as a single node
+            items_count = len(directory_node.get_all_items())
+            parent_dot_object.node(aggregate_nodes[directory_node],
+                                   '{}\n{} projects'.format(label_text, items_count),
+                                   tooltip=current_path,
+                                   **_global_aggregate_node_style)
+            return
+
+        subgraph_name = ProjectDependencyPrinter.make_subgraph_name_by_path(
+            current_path, hide_paths)
+        with parent_dot_object.subgraph(name=subgraph_name) as new_subgraph:
+            new_subgraph.attr(label=label_text)
+
+            for project in directory_node.items_in_directory:
+                node_color = ProjectDependencyPrinter.get_project_output_type_color(project)
+                new_subgraph.node('node' + str(project.get_number()),
+                                  project.get_project_filename(),
+                                  color=node_color,
+                                  tooltip=project.get_project_filepath())
+
+            for child in directory_node.childrens:
+                ProjectDependencyPrinter.print_directories_tree(child,
+                                                                new_subgraph,
+                                                                common_path,
+                                                                hide_paths,
+                                                                aggregate_nodes)
+
+    def print_projects(self, projects, parent_graph, **kwarg):
+        for project in projects:
+            parent_graph.node('node' + str(project.get_number()),
+                              project.get_project_filepath().replace('\\', '/'),
+                              kwarg)
+
+    @staticmethod
+    def print_edges(edges, parent_graph):
+        '''Prints edges collected as {(tail, head): [(tooltip, color, is_highlighted), ...]}.
+           Several dependencies between the same nodes are merged into a single weighted edge'''
+        for (tail_name, head_name), merged_edges in edges.items():
+            is_highlighted = any(highlighted for _, _, highlighted in merged_edges)
+
+            if len(merged_edges) == 1:
+                edge_tooltip, edge_color, _ = merged_edges[0]
+                if is_highlighted:
+                    parent_graph.edge(tail_name, head_name,
+                                      tooltip=edge_tooltip,
+                                      **_global_critical_path_edge_style)
+                else:
+                    parent_graph.edge(tail_name, head_name,
+                                      tooltip=edge_tooltip,
+                                      color=edge_color)
+                continue
+
+            edge_style = dict(label=str(len(merged_edges)),
+                              weight=str(len(merged_edges)),
+                              penwidth=str(min(1 + len(merged_edges), 8)))
+
+            tooltips = [edge_tooltip for edge_tooltip, _, _ in merged_edges]
+            if len(tooltips) > 10:
+                tooltips = tooltips[:10] + ['...']
+            edge_style['tooltip'] = '\n'.join(tooltips)
+
+            colors = set(edge_color for _, edge_color, _ in merged_edges)
+            if len(colors) == 1:
+                edge_style['color'] = colors.pop()
+
+            if is_highlighted:
+                edge_style.update(_global_critical_path_edge_style)
+
+            parent_graph.edge(tail_name, head_name, **edge_style)
+
+    @staticmethod
+    def get_aggregate_nodes(directories_tree, unknown_projects, gv_settings, packages_count=0,
+                            stubs_count=0):
+        '''Returns names of the aggregate nodes for the collapsed directories,
+           names of the nodes which replace the projects on the image
+           and whether the packages are printed as a single node'''
+        aggregate_nodes = {}
+        aggregated_projects = {}
+        is_packages_aggregated = False
+
+        if gv_settings.max_nodes is None and gv_settings.collapse_depth is None:
+            return aggregate_nodes, aggregated_projects, is_packages_aggregated
+
+        reserved_nodes = len(unknown_projects) + packages_count + stubs_count
+        if gv_settings.max_nodes is not None and reserved_nodes >= gv_settings.max_nodes and \
+                packages_count > 1:
+            # there is no room for the packages, so print them as a single node
+            is_packages_aggregated = True
+            reserved_nodes -= packages_count - 1
+
+        if gv_settings.max_nodes is not None and reserved_nodes >= gv_settings.max_nodes and \
+                len(unknown_projects) > 1:
+            # there is no room even for the unknown projects, so print them as a single node
+            reserved_nodes -= len(unknown_projects) - 1
+            for project in unknown_projects:
+                aggregated_projects[project] = _global_unknown_aggregate_node_name
+
+        collapsed_directories = get_collapsed_directories(directories_tree,
+                                                          gv_settings.max_nodes,
+                                                          gv_settings.collapse_depth,
+                                                          reserved_nodes)
+        for number, directory_node in enumerate(collapsed_directories):
+            node_name = 'dir' + str(number)
+            aggregate_nodes[directory_node] = node_name
+            for project in directory_node.get_all_items():
+                aggregated_projects[project] = node_name
+
+        return aggregate_nodes, aggregated_projects, is_packages_aggregated
+
+    @staticmethod
+    def create_digraph(gv_settings, filename, diagram_label):
+        if gv_settings.native_render:
+            from pdv.layered_svg import LayeredDigraph
+
+            digraph_object = LayeredDigraph(name=gv_settings.graph_name,
+                                            comment=gv_settings.comment,
+                                            filename=filename,
+                                            directory=gv_settings.directory)
+        else:
+            import graphviz
+
+            digraph_object = graphviz.Digraph(name=gv_settings.graph_name,
+                                              comment=gv_settings.comment,
+                                              filename=filename,
+                                              directory=gv_settings.directory,
+                                              format=gv_settings.output_format,
+                                              engine=gv_settings.engine)
+
+        ProjectDependencyPrinter.set_default_graph_settings(digraph_object)
+        ProjectDependencyPrinter.set_default_graph_nodes_settings(digraph_object)
+        ProjectDependencyPrinter.set_default_graph_edges_settings(digraph_object)
+        digraph_object.attr(label=diagram_label)
+
+        return digraph_object
+
+    def print_projects_graph(self, digraph_object, existing_projects, unknown_projects,
+                             gv_settings, stub_links=None):
+        '''Prints the projects with their dependencies to the digraph_object.
+           Dependencies on the existing projects which are not in existing_projects
+           are printed as stub nodes with links from stub_links {project: (label, href)},
+           a single stub node for every link'''
+        directories_tree = build_directory_tree(existing_projects)
+        #print_node(directories_tree)
+        #print_node(directories_tree.childrens[0], True)
+        #print_node(directories_tree.childrens[1])
+        #print_node(directories_tree.childrens[2])
+        #print_directory_tree(directories_tree)
+
+        printed_packages = {}
+        if self.package_index is not None:
+            printed_packages = self.get_printed_packages(existing_projects, gv_settings)
+
+        stub_nodes = {}
+        if stub_links:
+            for number, link in enumerate(sorted(set(stub_links.values()))):
+                stub_nodes[link] = 'stub' + str(number)
+
+        aggregate_nodes, aggregated_projects, is_packages_aggregated = \
+            ProjectDependencyPrinter.get_aggregate_nodes(directories_tree, unknown_projects,
+                                                         gv_settings, len(printed_packages),
+                                                         len(stub_nodes))
+
+        stub_projects = set()
+
+        def get_node_name(project):
+            if stub_links is not None and project in stub_links:
+                stub_projects.add(project)
+                return stub_nodes[stub_links[project]]
+            return aggregated_projects.get(project, 'node' + str(project.get_number()))
+
+        # collect edges, edges between the same (aggregate) nodes are merged
+        edges = {}
+        for project in existing_projects:
+            project_name = project.get_project_filename()
+            for dependency_project in self.projects_settings.get_printed_dependencies(project):
+                tail_name = get_node_name(project)
+                head_name = get_node_name(dependency_project)
+                if tail_name == head_name and project in aggregated_projects:
+                    # dependency inside the aggregate node
+                    continue
+
+                dependency_project_name = dependency_project.get_project_filename()
+                edge_tooltip = project_name + " -> "  + dependency_project_name
+                edge_color = ProjectDependencyPrinter.get_project_output_type_color(
+                    dependency_project)
+                if not dependency_project.is_project_exists():
+                    edge_color = _global_unknown_edge_style['color']
+
+                is_highlighted = (project, dependency_project) in self.highlighted_dependencies
+                edges.setdefault((tail_name, head_name), []).append(
+                    (edge_tooltip, edge_color, is_highlighted))
+
+        if printed_packages:
+            def get_package_node_name(package_id):
+                if is_packages_aggregated:
+                    return _global_packages_aggregate_node_name
+                return 'package' + str(package_id)
+
+            self.collect_package_edges(edges, existing_projects, printed_packages,
+                                       get_node_name, get_package_node_name)
+
+        # print edges
+        ProjectDependencyPrinter.print_edges(edges, digraph_object)
+
+        # print nodes for existing projects
+        self.print_directories_tree(directories_tree, digraph_object, None, gv_settings.hide_paths,
+                                    aggregate_nodes)
+
+        # nodes are already printed in their clusters, here only their style is extended
+        for project in sorted(self.highlighted_projects & set(existing_projects)):
+            if project not in aggregated_projects:
+                digraph_object.node('node' + str(project.get_number()),
+                                    **_global_critical_path_node_style)
+
+        # print nodes for unknown projects
+        if unknown_projects and \
+                _global_unknown_aggregate_node_name in aggregated_projects.values():
+            digraph_object.node(_global_unknown_aggregate_node_name,
+                                '{} unknown projects'.format(len(unknown_projects)),
+                                **_global_unknown_node_style)
+        else:
+            self.print_projects(unknown_projects, digraph_object,
+                                **_global_unknown_node_style)
+
+        # print nodes for packages
+        if is_packages_aggregated:
+            self.print_packages_aggregate(printed_packages, digraph_object)
+        else:
+            for package_id, is_conflict in sorted(printed_packages.items()):
+                self.print_package(package_id, is_conflict, digraph_object)
+
+        # print nodes for projects from the other shards
+        stubs_projects = {}
+        for project in sorted(stub_projects):
+            stubs_projects.setdefault(stub_links[project], []).append(project)
+
+        for (shard_label, shard_href), projects in sorted(stubs_projects.items()):
+            if len(projects) == 1:
+                stub_label = '{}\n[{}]'.format(projects[0].get_project_filename(), shard_label)
+            else:
+                stub_label = '{} projects\n[{}]'.format(len(projects), shard_label)
+            digraph_object.node(stub_nodes[(shard_label, shard_href)], stub_label,
+                                tooltip='\n'.join(project.get_project_filepath()
+                                                   for project in projects),
+                                href=shard_href,
+                                **_global_stub_node_style)
+
+    def get_printed_packages(self, projects, gv_settings):
+        '''Returns {package id: is the package highlighted as a versions conflict}
+           for the packages referenced by the projects'''
+        projects = set(projects)
+        printed_packages = {}
+
+        for package_id in range(self.package_index.get_packages_count()):
+            if any(project in projects for project, _ in
+                   self.package_index.get_package_references(package_id)):
+                printed_packages[package_id] = gv_settings.highlight_package_conflicts and \
+                    self.package_index.is_conflict(package_id)
+
+        return printed_packages
+
+    def collect_package_edges(self, edges, projects, printed_packages, get_node_name,
+                              get_package_node_name):
+        '''Adds edges from the projects to their packages into the edges'''
+        projects = set(projects)
+
+        for package_id, is_conflict in sorted(printed_packages.items()):
+            package_name = self.package_index.names[package_id]
+            if is_conflict:
+                versions = self.package_index.get_package_versions(package_id)
+                # empty versions (defined elsewhere) are not a part of the conflict
+                versions.pop('', None)
+                main_version = max(sorted(versions), key=lambda version: versions[version])
+
+            for project, version in self.package_index.get_package_references(package_id):
+                if project not in projects:
+                    continue
+
+                edge_color = _global_package_edge_style['color']
+                if is_conflict and version and version != main_version:
+                    edge_color = _global_package_conflict_edge_style['color']
+
+                edge_tooltip = '{} -> {} {}'.format(project.get_project_filename(),
+                                                    package_name, version or '*')
+                edges.setdefault((get_node_name(project), get_package_node_name(package_id)),
+                                 []).append((edge_tooltip, edge_color, False))
+
+    def print_packages_aggregate(self, printed_packages, digraph_object):
+        node_style = dict(_global_package_node_style)
+        if any(printed_packages.values()):
+            node_style.update(_global_package_conflict_node_style)
+
+        packages_names = sorted(self.package_index.names[package_id]
+                                for package_id in printed_packages)
+        digraph_object.node(_global_packages_aggregate_node_name,
+                            '{} packages'.format(len(packages_names)),
+                            tooltip='\n'.join(packages_names),
+                            **node_style)
+
+    def print_package(self, package_id, is_conflict, digraph_object):
+        versions = self.package_index.get_package_versions(package_id)
+        versions_labels = sorted(version for version in versions if version)
+        if len(versions_labels) > 3:
+            versions_labels = versions_labels[:3] + ['...']
+
+        node_style = dict(_global_package_node_style)
+        if is_conflict:
+            node_style.update(_global_package_conflict_node_style)
+
+        digraph_object.node('package' + str(package_id),
+                            '\n'.join([self.package_index.names[package_id]] + versions_labels),
+                            tooltip='\n'.join('{}: {} projects'.format(version or '*', count)
+                                              for version, count in sorted(versions.items())),
+                            **node_style)
+
+    @staticmethod
+    def output_digraphs(digraph_objects, need_render):
+        '''Saves (and renders) the digraphs. The rendering is done in parallel'''
+        def output_digraph(digraph_object):
+            if need_render:
+                digraph_object.render()
+            else:
+                digraph_object.save()
+
+        if len(digraph_objects) == 1:
+            output_digraph(digraph_objects[0])
+            return
+
+        import concurrent.futures
+
+        # graphviz renders in a separate process for each digraph
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            for _ in executor.map(output_digraph, digraph_objects):
+                pass
+
+    def _get_shards(self, existing_projects, gv_settings):
+        if gv_settings.shard_by == ShardingMethods.BY_DIRECTORY:
+            return get_directory_shards(build_directory_tree(existing_projects))
+
+        edges = [(project, dependency_project)
+                 for project in existing_projects
+                 for dependency_project in self.projects_settings.get_printed_dependencies(project)
+                 if dependency_project.is_project_exists()]
+        return get_min_cut_shards(existing_projects, edges, gv_settings.shards_count)
+
+    def create_sharded_diagrams(self, existing_projects, unknown_projects, gv_settings):
+        '''Prints a diagram for every shard of the projects and an index diagram of the shards.
+           The index diagram is saved to gv_settings.filename'''
+        shards = self._get_shards(existing_projects, gv_settings)
+        logging.info('Projects are split into %d shards', len(shards))
+
+        filename_base, filename_ext = os.path.splitext(gv_settings.filename)
+        shard_filenames = ['{}_shard{}{}'.format(filename_base, number, filename_ext)
+                           for number in range(len(shards))]
+        shard_hrefs = [filename + '.' + gv_settings.output_format
+                       for filename in shard_filenames]
+
+        project_shards = {}
+        for number, (_, shard_projects) in enumerate(shards):
+            for project in shard_projects:
+                project_shards[project] = number
+
+        digraph_objects = []
+        shards_edges = {}
+        for number, (shard_label, shard_projects) in enumerate(shards):
+            shard_unknown_projects = set()
+            stub_links = {}
+            for project in shard_projects:
+                for dependency_project in self.projects_settings.get_printed_dependencies(project):
+                    if dependency_project in unknown_projects:
+                        shard_unknown_projects.add(dependency_project)
+                        continue
+
+                    dependency_shard = project_shards[dependency_project]
+                    if dependency_shard != number:
+                        stub_links[dependency_project] = (shards[dependency_shard][0],
+                                                          shard_hrefs[dependency_shard])
+                        shards_edges[(number, dependency_shard)] = \
+                            shards_edges.get((number, dependency_shard), 0) + 1
+
+            digraph_object = ProjectDependencyPrinter.create_digraph(
+                gv_settings, shard_filenames[number],
+                '{} [{}]'.format(gv_settings.diagram_label, shard_label))
+            self.print_projects_graph(digraph_object, shard_projects, shard_unknown_projects,
+                                      gv_settings, stub_links)
+            digraph_objects.append(digraph_object)
+
+        # index of the shards
+        index_digraph_object = ProjectDependencyPrinter.create_digraph(
+            gv_settings, gv_settings.filename, gv_settings.diagram_label)
+        for number, (shard_label, shard_projects) in enumerate(shards):
+            index_digraph_object.node('shard' + str(number),
+                                      '{}\n{} projects'.format(shard_label, len(shard_projects)),
+                                      tooltip=shard_filenames[number],
+                                      href=shard_hrefs[number],
+                                      **_global_aggregate_node_style)
+        for (tail_shard, head_shard), edges_count in sorted(shards_edges.items()):
+            index_digraph_object.edge('shard' + str(tail_shard), 'shard' + str(head_shard),
+                                      label=str(edges_count),
+                                      weight=str(edges_count))
+        digraph_objects.append(index_digraph_object)
+
+        ProjectDependencyPrinter.output_digraphs(digraph_objects, gv_settings.need_render)
+
+    def highlight_critical_path(self, existing_projects):
+        from pdv.analytics import analyze_build
+
+        build_analysis = analyze_build(existing_projects,
+                                       self.projects_settings.get_printed_dependencies,
+                                       self.projects_settings.get_build_times())
+        self.highlighted_projects.update(build_analysis.critical_path)
+        self.highlighted_dependencies.update(build_analysis.get_critical_path_dependencies())
+
+    def create_projects_diagram(self, gv_settings):
+        existing_projects, unknown_projects = self.projects_settings.collect_projects()
+        self.create_collected_projects_diagram(existing_projects, unknown_projects, gv_settings)
+
+    def create_collected_projects_diagram(self, existing_projects, unknown_projects,
+                                          gv_settings):
+        if gv_settings.highlight_critical_path:
+            self.highlight_critical_path(existing_projects)
+
+        if self.projects_settings.collect_packages:
+            from pdv.packages import build_package_index
+
+            self.package_index = build_package_index(existing_projects)
+
+        logging.info('Printing projects...')
+
+        if gv_settings.shard_by and existing_projects:
+            self.create_sharded_diagrams(existing_projects, unknown_projects, gv_settings)
+        else:
+            digraph_object = ProjectDependencyPrinter.create_digraph(
+                gv_settings, gv_settings.filename, gv_settings.diagram_label)
+            self.print_projects_graph(digraph_object, existing_projects, unknown_projects,
+                                      gv_settings)
+            ProjectDependencyPrinter.output_digraphs([digraph_object], gv_settings.need_render)
+
+        #digraph_object.view()
+        logging.info('Projects printed')
@@ -0,0 +1,129 @@
+import os
+import logging
+
+import numpy
+
+from pdv.graph import condense_graph
+
+
+def _normalize_path(path):
+    # relative paths are resolved from the current directory like the paths of the index
+    return os.path.abspath(path).lower()
+
+
+class ReachabilityIndex:
+    '''Transitive closure of the dependencies graph for change-impact queries.
+
+       Projects are numbered in the topological order: dependencies before their
+       dependents. Row of a project is a bitset (packed into uint64 words) of the
+       project itself and all the projects which depend on it directly or not,
+       i.e. the projects affected by a change of the project.'''
+    def __init__(self, paths, rows):
+        self.paths = list(paths)
+        self.rows = rows
+        self._ids = dict((_normalize_path(path), number)
+                         for number, path in enumerate(self.paths))
+
+        self._directories_ids = {}
+        for number, path in enumerate(self.paths):
+            directory = _normalize_path(os.path.dirname(path))
+            self._directories_ids.setdefault(directory, []).append(number)
+
+    @staticmethod
+    def build(projects, get_dependencies):
+        '''Builds the index for the projects.
+           get_dependencies(project) returns dependencies of the project to account'''
+        # components of the dependencies come before components of their dependents
+        components, _, get_successors = condense_graph(projects, get_dependencies)
+
+        ordered_projects = [project for component in components for project in component]
+        ids = dict((project, number) for number, project in enumerate(ordered_projects))
+
+        projects_count = len(ordered_projects)
+        words_count = (projects_count + 63) // 64
+        rows = numpy.zeros((projects_count, words_count), dtype='<u8')
+
+        dependents = [[] for _ in range(projects_count)]
+        for project in ordered_projects:
+            for dependency in get_successors(project):
+                dependents[ids[dependency]].append(ids[project])
+
+        # dependents have greater ids (or belong to the same component),
+        # so the components are processed from the last one
+        for component in reversed(components):
+            component_ids = [ids[project] for project in component]
+            component_row = numpy.zeros(words_count, dtype='<u8')
+            for project_id in component_ids:
+                component_row[project_id >> 6] |= numpy.uint64(1 << (project_id & 63))
+                for dependent_id in dependents[project_id]:
+                    component_row |= rows[dependent_id]
+            rows[component_ids] = component_row
+
+        logging.info('Reachability index for %d projects built (%d cycles)',
+                     projects_count, sum(1 for component in components if len(component) > 1))
+
+        return ReachabilityIndex([project.get_project_filepath() for project in ordered_projects],
+                                 rows)
+
+    def save(self, index_filepath):
+        '''Saves the index to the numpy *.npz file'''
+        index_directory = os.path.dirname(index_filepath)
+        if index_directory:
+            os.makedirs(index_directory, exist_ok=True)
+
+        with open(index_filepath, 'wb') as index_file:
+            numpy.savez_compressed(index_file,
+                                   paths=numpy.array(self.paths, dtype=str),
+                                   rows=self.rows)
+
+        logging.info('Reachability index saved to [%s]', index_filepath)
+
+    @staticmethod
+    def load(index_filepath):
+        with numpy.load(index_filepath, allow_pickle=False) as index_data:
+            return ReachabilityIndex(index_data['paths'].tolist(),
+                                     index_data['rows'].astype('<u8', copy=False))
+
+    def get_owning_ids(self, filepath):
+        '''Returns ids of the projects owning the file: the project file itself
+           or projects from the nearest parent directory of the file'''
+        normalized_path = _normalize_path(filepath)
+        if normalized_path in self._ids:
+            return [self._ids[normalized_path]]
+
+        directory = os.path.dirname(normalized_path)
+        while True:
+            if directory in self._directories_ids:
+                return self._directories_ids[directory]
+
+            parent_directory = os.path.dirname(directory)
+            if parent_directory == directory:
+                return []
+            directory = parent_directory
+
+    def get_affected_ids(self, changed_ids):
+        '''Returns sorted ids of the projects affected by a change of the given projects'''
+        if not changed_ids:
+            return []
+
+        affected_row = numpy.bitwise_or.reduce(self.rows[sorted(set(changed_ids))], axis=0)
+        affected_bits = numpy.unpackbits(affected_row.view(numpy.uint8), bitorder='little')
+
+        return numpy.flatnonzero(affected_bits[:len(self.paths)]).tolist()
+
+    def get_affected_projects(self, changed_filepaths):
+        '''Returns paths of the projects affected by the changed files
+           and the changed files which do not belong to any project'''
+        changed_ids = []
+        unowned_filepaths = []
+        for filepath in changed_filepaths:
+            owning_ids = self.get_owning_ids(filepath)
+            if owning_ids:
+                changed_ids.extend(owning_ids)
+            else:
+                unowned_filepaths.append(filepath)
+
+        affected_paths = [self.paths[project_id]
+                          for project_id in self.get_affected_ids(changed_ids)]
+
+        return affected_paths, unowned_filepaths
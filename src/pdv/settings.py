@@ -0,0 +1,198 @@
+import os
+import re
+import logging
+
+from pdv.context import parse_config
+from pdv.msbuild import DependenciesCollector, is_standard_project
+
+
+class GraphVizSettings:
+    def __init__(self, graph_name, comment, filename, directory,
+                 output_format, engine, diagram_label, need_render,
+                 hide_paths, max_nodes=None, collapse_depth=None,
+                 shard_by=None, shards_count=None, highlight_critical_path=False,
+                 native_render=False, highlight_package_conflicts=False):
+        self.graph_name = graph_name
+        self.comment = comment
+        self.filename = filename
+        self.directory = directory
+        self.output_format = output_format
+        self.engine = engine
+        self.diagram_label = diagram_label
+        self.need_render = need_render
+        self.hide_paths = hide_paths
+        self.max_nodes = max_nodes
+        self.collapse_depth = collapse_depth
+        self.shard_by = shard_by
+        self.shards_count = shards_count
+        self.highlight_critical_path = highlight_critical_path
+        self.native_render = native_render
+        self.highlight_package_conflicts = highlight_package_conflicts
+
+
+class OutputSettings:
+    '''Outputs of the collected graph made instead of the graphviz diagram
+       (or together with it when need_diagram is set)'''
+    def __init__(self, json_filepath=None, impact_index_filepath=None,
+                 build_analysis_filepath=None, package_matrix_filepath=None,
+                 need_diagram=False):
+        self.json_filepath = json_filepath
+        self.impact_index_filepath = impact_index_filepath
+        self.build_analysis_filepath = build_analysis_filepath
+        self.package_matrix_filepath = package_matrix_filepath
+        self.need_diagram = need_diagram
+
+    def has_outputs(self):
+        return bool(self.json_filepath or self.impact_index_filepath or
+                    self.build_analysis_filepath or self.package_matrix_filepath)
+
+
+class ProjectsSettings:
+    def __init__(self, projects, solutions, dependenies_info, config, ignore_std, ignore_deps,
+                 use_prescan=True, build_times=None, discover_roots=None,
+                 discovery_walker=None, collect_packages=False):
+        self.projects = projects
+        self.solutions = solutions
+        self.dependenies_info = dependenies_info
+        self.config = config
+        self.ignore_std = ignore_std
+        self.ignore_deps = ignore_deps
+        self.use_prescan = use_prescan
+        self.build_times = build_times
+        self.discover_roots = discover_roots
+        self.discovery_walker = discovery_walker
+        self.collect_packages = collect_packages
+
+    def get_graph_root(self):
+        '''Returns the directory the projects paths of the graph are relative to: the
+           directory of the solutions, of the discovery roots or the current directory.
+           It does not depend on the found projects, so the graphs of different
+           copies of the sources have the same relative paths'''
+        directories = [os.path.dirname(os.path.abspath(solution))
+                       for solution in self.solutions or []]
+        if not directories:
+            directories = [os.path.abspath(root) for root in self.discover_roots or []]
+        if not directories:
+            return os.getcwd()
+
+        try:
+            return os.path.commonpath(directories)
+        except ValueError:
+            # another drive
+            return directories[0]
+
+    def get_build_times(self):
+        '''Returns build times of the projects read from the self.build_times csv file'''
+        if not self.build_times:
+            return None
+
+        from pdv.analytics import read_build_times
+
+        return read_build_times(self.build_times)
+
+    def should_ignore_project_deps(self, project):
+        should_ignore = False
+
+        if self.ignore_deps:
+            for ignore in self.ignore_deps:
+                if project.get_project_filepath().lower().endswith(ignore.lower()):
+                    should_ignore = True
+                    break
+
+        return should_ignore
+
+    def get_printed_dependencies(self, project):
+        '''Returns dependencies of the project which should be printed on the image'''
+        if self.should_ignore_project_deps(project):
+            # do not print dependencies for the projects to be ignored
+            return []
+
+        dependencies = []
+        for dependency_project in project.get_project_dependencies():
+            if self.should_ignore_project_deps(dependency_project):
+                # do not print projects to be ignored
+                continue
+
+            if self.ignore_std and \
+                is_standard_project(dependency_project.get_project_filename()):
+                continue
+
+            dependencies.append(dependency_project)
+
+        return dependencies
+
+    @staticmethod
+    def get_projects_contents(sln_content):
+        pattern = re.compile(r'\bProject\(.+?\bEndProject\b', re.DOTALL)
+
+        return pattern.findall(sln_content)
+
+    @staticmethod
+    def parse_solution(sln_filepath):
+        projects_paths = []
+        sln_filepath_abs = os.path.abspath(sln_filepath)
+
+        for guess_encoding in ('utf-8', 'utf-16', 'cp1252', None):
+            try:
+                logging.debug('Try to read the solution [%s] using encoding: [%s]',
+                              sln_filepath_abs, guess_encoding)
+                with open(sln_filepath_abs, 'rt', encoding=guess_encoding) as sln_file:
+                    sln_content = sln_file.read()
+            except UnicodeError:
+                logging.debug('Failed to read the solution using encoding: %s', guess_encoding)
+                continue
+            else:
+                break
+
+        projects_contents = ProjectsSettings.get_projects_contents(sln_content)
+
+        for content in projects_contents:
+            project_path = content.split(',')[1].strip(' "')
+
+            # TODO: should we use 'proj' here?
+            if project_path.endswith('proj'):
+                if not os.path.isabs(project_path):
+                    project_path = os.path.normpath(
+                        os.path.join(os.path.dirname(sln_filepath_abs), project_path))
+                    projects_paths.append(project_path)
+
+        return projects_paths
+
+    def get_discovered_projects(self):
+        '''Yields projects found under self.discover_roots while they are being found'''
+        from pdv.discovery import ProjectFilesWalker, is_solution_file
+
+        walker = self.discovery_walker if self.discovery_walker else ProjectFilesWalker()
+        for filepath in walker.walk(self.discover_roots):
+            if is_solution_file(filepath):
+                yield from ProjectsSettings.parse_solution(filepath)
+            else:
+                yield filepath
+
+    def iterate_all_projects(self):
+        if self.projects:
+            yield from (os.path.abspath(project) for project in self.projects)
+        if self.solutions:
+            for sln in self.solutions:
+                yield from ProjectsSettings.parse_solution(sln)
+        if self.discover_roots:
+            yield from self.get_discovered_projects()
+
+    def get_all_projects(self):
+        return list(self.iterate_all_projects())
+
+    def collect_projects(self, variables=None):
+        '''Returns existing and unknown projects found starting from the all projects.
+           variables override the ones from the config'''
+        logging.info('Collecting projects dependencies...')
+
+        if self.config:
+            config_variables = parse_config(self.config)
+            config_variables.update(variables or {})
+            variables = config_variables
+        dependencies_collector = DependenciesCollector(self.dependenies_info,
+                                                       self.use_prescan,
+                                                       variables,
+                                                       self.collect_packages)
+        # discovered projects are collected while the discovery goes on
+        return dependencies_collector.collect_dependencies(self.iterate_all_projects())
@@ -0,0 +1,95 @@
+import os
+import enum
+import math
+import logging
+
+
+class ShardingMethods(enum.Enum):
+    BY_DIRECTORY = 'directory'
+    BY_MIN_CUT = 'mincut'
+
+
+def get_directory_shards(root_node):
+    '''Returns a list of (label, items) for the items of the root directory
+       and for every top-level subdirectory'''
+    if not root_node:
+        return []
+
+    root_path = root_node.get_directory_name()
+
+    shards = []
+    if root_node.items_in_directory:
+        shards.append((os.path.join(root_path, '').replace('\\', '/'),
+                       list(root_node.items_in_directory)))
+
+    for child in root_node.childrens:
+        child_label = os.path.relpath(child.get_directory_name(), root_path)
+        shards.append((child_label.replace('\\', '/'), child.get_all_items()))
+
+    return shards
+
+
+def get_min_cut_shards(projects, dependencies, shards_count, max_passes=10):
+    '''Returns a list of (label, projects) for shards_count balanced shards
+       with a small number of dependencies between the shards.
+
+       The initial shards are chunks of the sorted projects (so projects of the same
+       directory stay together). Then every project is moved to the shard where most
+       of its neighbours are while this reduces the cut and keeps the shards balanced.'''
+    projects_sorted = sorted(projects)
+    projects_count = len(projects_sorted)
+    shards_count = max(1, min(shards_count, projects_count))
+
+    project_shards = dict((project, number * shards_count // projects_count)
+                          for number, project in enumerate(projects_sorted))
+    shards_sizes = [0] * shards_count
+    for shard in project_shards.values():
+        shards_sizes[shard] += 1
+
+    max_shard_size = math.ceil(projects_count / shards_count * 1.1)
+    min_shard_size = max(1, math.floor(projects_count / shards_count * 0.9))
+
+    neighbours = dict((project, []) for project in projects_sorted)
+    for project, dependency_project in dependencies:
+        if project in neighbours and dependency_project in neighbours:
+            neighbours[project].append(dependency_project)
+            neighbours[dependency_project].append(project)
+
+    for _ in range(max_passes):
+        moved_count = 0
+        for project in projects_sorted:
+            current_shard = project_shards[project]
+            if shards_sizes[current_shard] <= min_shard_size:
+                continue
+
+            neighbours_counts = {}
+            for neighbour in neighbours[project]:
+                neighbour_shard = project_shards[neighbour]
+                neighbours_counts[neighbour_shard] = neighbours_counts.get(neighbour_shard, 0) + 1
+
+            best_shard = current_shard
+            best_count = neighbours_counts.get(current_shard, 0)
+            for shard, count in sorted(neighbours_counts.items()):
+                if count > best_count and shards_sizes[shard] < max_shard_size:
+                    best_shard, best_count = shard, count
+
+            if best_shard != current_shard:
+                project_shards[project] = best_shard
+                shards_sizes[current_shard] -= 1
+                shards_sizes[best_shard] += 1
+                moved_count += 1
+
+        if not moved_count:
+            break
+
+    cut_size = sum(1 for project, dependency_project in dependencies
+                   if project in project_shards and dependency_project in project_shards and
+                   project_shards[project] != project_shards[dependency_project])
+    logging.info('%d dependencies between %d shards', cut_size, shards_count)
+
+    shards = [[] for _ in range(shards_count)]
+    for project in projects_sorted:
+        shards[project_shards[project]].append(project)
+
+    return [('shard ' + str(number), shard_projects)
+            for number, shard_projects in enumerate(shards) if shard_projects]
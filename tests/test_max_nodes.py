@@ -0,0 +1,111 @@
+import os
+import re
+import sys
+import glob
+import logging
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import pdv
+
+
+_global_project_template = '''<?xml version="1.0" encoding="utf-8"?>
+<Project ToolsVersion="15.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <PropertyGroup>
+    <OutputType>Library</OutputType>
+  </PropertyGroup>
+  <ItemGroup>
+{}  </ItemGroup>
+</Project>
+'''
+
+
+_global_node_pattern = re.compile(r'^\s*(\w+) \[')
+
+
+def write_projects(root_dir, projects_count):
+    '''Writes projects in a directories tree, every project references two previous
+       projects, every 5th one references a missing project and every project
+       references one of the 4 packages with 2 versions. Returns the projects paths'''
+    projects_paths = [os.path.join(root_dir, 'group{}'.format(number % 3),
+                                   'sub{}'.format(number % 2), 'Project{}'.format(number),
+                                   'Project{}.csproj'.format(number))
+                      for number in range(projects_count)]
+
+    for number, project_filepath in enumerate(projects_paths):
+        project_dir = os.path.dirname(project_filepath)
+        items = [projects_paths[dependency] for dependency in (number - 1, number // 2)
+                 if 0 <= dependency < number]
+        if number % 5 == 0:
+            items.append(os.path.join(root_dir, 'Missing{}'.format(number // 5),
+                                      'Missing.csproj'))
+        lines = ['    <ProjectReference Include="{}" />\n'.format(
+            os.path.relpath(item, project_dir)) for item in sorted(set(items))]
+        lines.append('    <PackageReference Include="Package{}" Version="1.{}" />\n'.format(
+            number % 4, number % 2))
+
+        os.makedirs(project_dir)
+        with open(project_filepath, 'wt') as project_file:
+            project_file.write(_global_project_template.format(''.join(lines)))
+
+    return projects_paths
+
+
+def count_nodes(gv_filepath):
+    '''Returns the number of the nodes declared in the graphviz source'''
+    names = set()
+    with open(gv_filepath, 'rt', encoding='utf-8') as gv_file:
+        for line in gv_file:
+            match = _global_node_pattern.match(line)
+            if match and match.group(1) not in ('node', 'edge', 'graph'):
+                names.add(match.group(1))
+    return len(names)
+
+
+class MaxNodesTest(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projects_paths = write_projects(os.path.join(self.temp_dir.name, 'src'), 40)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def print_diagrams(self, max_nodes, options):
+        '''Returns paths of the graphviz sources of the projects
+           (the index of the shards is not a projects diagram)'''
+        out_dir = os.path.join(self.temp_dir.name, 'out_{}_{}'.format(
+            max_nodes, '_'.join(option.strip('-') for option in options)))
+        args_list = ['--dep-item', 'ProjectReference', '--outdir', out_dir,
+                     '--outfilename', 'projects.gv', '--max-nodes', str(max_nodes)]
+        for project_filepath in self.projects_paths:
+            args_list += ['--proj', project_filepath]
+        pdv.print_dependencies(args_list + options)
+
+        gv_filepaths = glob.glob(os.path.join(out_dir, 'projects_shard*.gv'))
+        return gv_filepaths if gv_filepaths else [os.path.join(out_dir, 'projects.gv')]
+
+    def check_max_nodes(self, options):
+        for max_nodes in (6, 10, 20):
+            for gv_filepath in self.print_diagrams(max_nodes, options):
+                with self.subTest(max_nodes=max_nodes, options=options,
+                                  diagram=os.path.basename(gv_filepath)):
+                    self.assertLessEqual(count_nodes(gv_filepath), max_nodes)
+
+    def test_projects(self):
+        self.check_max_nodes([])
+
+    def test_packages(self):
+        self.check_max_nodes(['--packages'])
+
+    def test_min_cut_shards(self):
+        self.check_max_nodes(['--shard-by', 'mincut', '--shards', '3'])
+
+    def test_directory_shards_with_packages(self):
+        self.check_max_nodes(['--shard-by', 'directory', '--packages'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from pdv.reachability import ReachabilityIndex
+
+
+class _Project(str):
+    def get_project_filepath(self):
+        return str(self)
+
+
+class AffectedProjectsTest(unittest.TestCase):
+    def setUp(self):
+        self.current_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root_dir = os.path.realpath(self.temp_dir.name)
+        os.chdir(root_dir)
+
+        self.app = _Project(os.path.join(root_dir, 'src', 'App', 'App.csproj'))
+        self.lib = _Project(os.path.join(root_dir, 'src', 'Lib', 'Lib.csproj'))
+        dependencies = {self.app: [self.lib], self.lib: []}
+        self.index = ReachabilityIndex.build([self.app, self.lib], dependencies.get)
+
+    def tearDown(self):
+        os.chdir(self.current_dir)
+        self.temp_dir.cleanup()
+
+    def test_relative_changed_file(self):
+        changed_filepath = os.path.join('src', 'Lib', 'Class1.cs')
+        affected_projects, unowned_files = self.index.get_affected_projects([changed_filepath])
+
+        self.assertEqual(sorted(affected_projects), sorted([self.app, self.lib]))
+        self.assertEqual(unowned_files, [])
+
+    def test_relative_changed_project(self):
+        changed_filepath = os.path.join('.', 'src', 'App', 'App.csproj')
+        affected_projects, unowned_files = self.index.get_affected_projects([changed_filepath])
+
+        self.assertEqual(affected_projects, [self.app])
+        self.assertEqual(unowned_files, [])
+
+
+class ReachabilityIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root_dir = os.path.realpath(self.temp_dir.name)
+
+        def create_project(name):
+            return _Project(os.path.join(root_dir, name, name + '.csproj'))
+
+        # App -> Service -> Core <-> Utils (cycle) -> Base, Tool is not related
+        self.app, self.service, self.core, self.utils, self.base, self.tool = map(
+            create_project, ('App', 'Service', 'Core', 'Utils', 'Base', 'Tool'))
+        dependencies = {self.app: [self.service],
+                        self.service: [self.core],
+                        self.core: [self.utils],
+                        self.utils: [self.core, self.base],
+                        self.base: [],
+                        self.tool: []}
+        self.projects = list(dependencies)
+        self.index = ReachabilityIndex.build(self.projects, dependencies.get)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_row(self, project):
+        return self.index.rows[self.index.get_owning_ids(project)[0]]
+
+    def test_cycle_shares_row(self):
+        numpy.testing.assert_array_equal(self.get_row(self.core), self.get_row(self.utils))
+
+    def test_transitive_dependents(self):
+        affected_projects, _ = self.index.get_affected_projects([self.base])
+
+        self.assertEqual(sorted(affected_projects), sorted(
+            [self.app, self.service, self.core, self.utils, self.base]))
+
+    def test_dependents_only(self):
+        affected_projects, _ = self.index.get_affected_projects([self.service])
+
+        self.assertEqual(sorted(affected_projects), sorted([self.app, self.service]))
+
+    def test_save_load(self):
+        index_filepath = os.path.join(self.temp_dir.name, 'index', 'projects.npz')
+        self.index.save(index_filepath)
+        loaded_index = ReachabilityIndex.load(index_filepath)
+
+        self.assertEqual(loaded_index.paths, self.index.paths)
+        numpy.testing.assert_array_equal(loaded_index.rows, self.index.rows)
+        for project in self.projects:
+            self.assertEqual(loaded_index.get_affected_projects([project]),
+                             self.index.get_affected_projects([project]))
+
+
+if __name__ == '__main__':
+    unittest.main()